@@ -0,0 +1,204 @@
+"""
+Time every Graph/WeightedGraph algorithm on seeded synthetic graphs of
+increasing size, and record the results as JSON.
+
+Usage:
+    python -m benchmarks.run_benchmarks --sizes 1000 10000 --output results.json
+    python -m benchmarks.run_benchmarks --compare results.json
+
+With --compare, the new timings are checked against an earlier results file,
+and the exit status is 1 if any benchmark got slower than --tolerance allows.
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from util import generators
+from util.file_reader import read_graph_from_file, write_graph_to_file
+
+AVERAGE_DEGREE = 4
+
+
+def _erdos_renyi(size, seed):
+    return generators.erdos_renyi(size, size * AVERAGE_DEGREE // 2, seed=seed)
+
+
+def _sparse_erdos_renyi(size, seed):
+    # below the giant-component threshold, so there are many components
+    return generators.erdos_renyi(size, size // 3, seed=seed)
+
+
+def _grid(size, seed):
+    side = max(2, int(math.sqrt(size)))
+    return generators.grid(side, side)
+
+
+def _dag(size, seed):
+    return generators.random_dag(size, size * AVERAGE_DEGREE // 2, seed=seed)
+
+
+def _weighted(size, seed):
+    return generators.random_weighted(size, size * AVERAGE_DEGREE // 2, seed=seed)
+
+
+@contextlib.contextmanager
+def _graph_file(size, seed):
+    handle, filename = tempfile.mkstemp(suffix='.txt')
+    os.close(handle)
+    try:
+        write_graph_to_file(_erdos_renyi(size, seed), filename)
+        yield filename
+    finally:
+        os.remove(filename)
+
+
+def _last_id(graph):
+    return list(graph.vertex_ids())[-1]
+
+
+# name -> (build the input for a size and seed, run the algorithm on it)
+BENCHMARKS = {
+    'bfs_traversal': (_erdos_renyi, lambda graph: graph.bfs_traversal('0')),
+    'find_shortest_path': (_erdos_renyi,
+                           lambda graph: graph.find_shortest_path('0', _last_id(graph))),
+    'find_vertices_n_away': (_erdos_renyi, lambda graph: graph.find_vertices_n_away('0', 3)),
+    'is_bipartite': (_grid, lambda graph: graph.is_bipartite()),
+    'find_connected_components': (_sparse_erdos_renyi,
+                                  lambda graph: graph.find_connected_components()),
+    'topological_sort': (_dag, lambda graph: graph.topological_sort()),
+    'minimum_spanning_tree_kruskal': (_weighted,
+                                      lambda graph: graph.minimum_spanning_tree_kruskal()),
+    'minimum_spanning_tree_prim': (_weighted, lambda graph: graph.minimum_spanning_tree_prim()),
+    'dijkstra': (_weighted, lambda graph: graph.find_shortest_path('0', _last_id(graph))),
+    'read_graph_from_file': (_graph_file, read_graph_from_file),
+}
+
+
+def _time(run, argument, repeat):
+    """Return the fastest of `repeat` runs, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(argument)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(run, argument):
+    """Return the peak number of bytes allocated during one run."""
+    tracemalloc.start()
+    try:
+        run(argument)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(name, size, seed=0, repeat=3):
+    """
+    Run one benchmark at one size.
+
+    Returns:
+    dict: The benchmark name, size, best time in seconds and peak memory in bytes.
+    """
+    build, run = BENCHMARKS[name]
+    argument = build(size, seed)
+    with contextlib.ExitStack() as stack:
+        if isinstance(argument, contextlib.AbstractContextManager):
+            argument = stack.enter_context(argument)
+        # keep stray output out of the timings
+        stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+        seconds = _time(run, argument, repeat)
+        peak_bytes = _peak_memory(run, argument)
+
+    return {
+        'benchmark': name,
+        'size': size,
+        'seconds': seconds,
+        'peak_bytes': peak_bytes,
+    }
+
+
+def run_benchmarks(names, sizes, seed=0, repeat=3, report=None):
+    """
+    Run every named benchmark at every size.
+
+    Returns:
+    dict: Metadata about the run and the list of results.
+    """
+    results = []
+    for name in names:
+        for size in sizes:
+            result = run_benchmark(name, size, seed, repeat)
+            results.append(result)
+            if report is not None:
+                report(result)
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def find_regressions(baseline, current, tolerance):
+    """
+    Return the (baseline, current) result pairs where the current time is more
+    than `tolerance` times the baseline time.
+    """
+    old = {(r['benchmark'], r['size']): r for r in baseline['results']}
+    return [(old[(r['benchmark'], r['size'])], r)
+            for r in current['results']
+            if (r['benchmark'], r['size']) in old
+            and r['seconds'] > old[(r['benchmark'], r['size'])]['seconds'] * tolerance]
+
+
+def _print_result(result):
+    print(f"{result['benchmark']:<32}{result['size']:>10}"
+          f"{result['seconds'] * 1000:>14.2f} ms{result['peak_bytes'] / 2 ** 20:>12.2f} MiB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), default=list(BENCHMARKS),
+                        help='run only these benchmarks')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', help='an earlier results file to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.only, args.sizes, args.seed, args.repeat, _print_result)
+    with open(args.output, 'w') as my_file:
+        json.dump(results, my_file, indent=2)
+    print(f'Results written to {args.output}')
+
+    if args.compare:
+        with open(args.compare) as my_file:
+            baseline = json.load(my_file)
+        regressions = find_regressions(baseline, results, args.tolerance)
+        for old, new in regressions:
+            print(f"REGRESSION {new['benchmark']} at size {new['size']}: "
+                  f"{old['seconds'] * 1000:.2f} ms -> {new['seconds'] * 1000:.2f} ms")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,148 @@
+import multiprocessing
+from array import array
+from collections import deque
+from functools import partial
+
+# The read-only CSRGraph a pool worker process answers queries against. Worker
+# processes receive it once when they start (for free when they are forked),
+# rather than once per query. Queries run in this process get the graph
+# passed explicitly instead.
+_shared_graph = None
+
+
+def _init_worker(graph):
+    global _shared_graph
+    _shared_graph = graph
+
+
+def _whole_graph_query(method_name, graph=None):
+    """Call a query method that takes no arguments, e.g. 'topological_sort', on the shared graph."""
+    return getattr(graph or _shared_graph, method_name)()
+
+
+def _group_by_source(queries):
+    """
+    Group queries by their first element, keeping the input position of each.
+
+    Returns:
+    list<(source, list<(position, argument)>)>: One task per distinct source,
+    ordered by the first time the source appears.
+    """
+    groups = {}
+    for position, (source, argument) in enumerate(queries):
+        groups.setdefault(source, []).append((position, argument))
+    return list(groups.items())
+
+
+def _shortest_paths_from(task, graph=None):
+    """
+    Answer every (source, target) query that shares one source with a single
+    breadth-first search tree, on `graph` or else the shared graph.
+    """
+    source_id, targets = task
+    graph = graph or _shared_graph
+    _, offsets, neighbors = graph.arrays()
+    if not graph.contains_id(source_id):
+        raise KeyError("One or both vertices are not in the graph!")
+    for _, target_id in targets:
+        if not graph.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+
+    source = graph.index_of(source_id)
+    parent = array('i', [-1]) * graph.num_vertices()
+    parent[source] = source
+    remaining = {graph.index_of(target_id) for _, target_id in targets}
+    remaining.discard(source)
+    queue = deque([source])
+
+    while queue and remaining:
+        current = queue.popleft()
+        for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+            if parent[neighbor] == -1:
+                parent[neighbor] = current
+                remaining.discard(neighbor)
+                queue.append(neighbor)
+
+    results = []
+    for position, target_id in targets:
+        target = graph.index_of(target_id)
+        if parent[target] == -1: # path not found
+            results.append((position, None))
+            continue
+        path = [target]
+        while path[-1] != source:
+            path.append(parent[path[-1]])
+        results.append((position, [graph.id_of(i) for i in reversed(path)]))
+    return results
+
+
+def _vertices_n_away_from(task, graph=None):
+    """
+    Answer every (source, distance) query that shares one source with a single
+    level-by-level breadth-first search, on `graph` or else the shared graph.
+    """
+    source_id, distances = task
+    graph = graph or _shared_graph
+    _, offsets, neighbors = graph.arrays()
+    if not graph.contains_id(source_id):
+        raise KeyError("Vertex is not in the graph!")
+
+    wanted = {distance for _, distance in distances}
+    max_distance = max(wanted)
+    levels = {0: [source_id]} if 0 in wanted else {}
+
+    seen = bytearray(graph.num_vertices())
+    source = graph.index_of(source_id)
+    seen[source] = 1
+    frontier = [source]
+    for distance in range(1, max_distance + 1):
+        next_frontier = []
+        for current in frontier:
+            for neighbor in neighbors[offsets[current]:offsets[current + 1]]:
+                if not seen[neighbor]:
+                    seen[neighbor] = 1
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+        if distance in wanted:
+            levels[distance] = [graph.id_of(i) for i in frontier]
+        if not frontier:
+            break
+
+    return [(position, list(levels.get(distance, [])))
+            for position, distance in distances]
+
+
+def run_batch(graph, function, queries, workers=1):
+    """
+    Run grouped queries against a frozen graph and yield the answers in input
+    order, as soon as each one (and everything before it) is ready.
+
+    Parameters:
+    graph (CSRGraph): The graph to query.
+    function (function): Answers one (source, [(position, argument)]) task.
+    queries (iterable<(source, argument)>): The queries to answer.
+    workers (integer): The number of worker processes. 1 runs in this process.
+    """
+    tasks = _group_by_source(queries)
+
+    if workers <= 1 or len(tasks) <= 1:
+        # pass the graph explicitly: another batch may be running in this process
+        yield from _in_order(map(partial(function, graph=graph), tasks))
+        return
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    chunk_size = max(1, len(tasks) // (workers * 4))
+    with context.Pool(workers, initializer=_init_worker, initargs=(graph,)) as pool:
+        yield from _in_order(pool.imap(function, tasks, chunk_size))
+
+
+def _in_order(group_results):
+    pending = {}
+    next_position = 0
+    for results in group_results:
+        for position, result in results:
+            pending[position] = result
+        while next_position in pending:
+            yield pending.pop(next_position)
+            next_position += 1
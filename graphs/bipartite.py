@@ -0,0 +1,95 @@
+from array import array
+
+
+def two_color(num_vertices, neighbor_indices):
+    """
+    Two-color a graph on the dense indices 0..n-1 with breadth-first search,
+    covering every component, in O(V + E). The colors, BFS parents and depths
+    and the queue are flat arrays, so a million vertices cost a few MB.
+
+    Parameters:
+    num_vertices (integer): The number of vertices.
+    neighbor_indices (function): Maps a vertex index to the indices of its
+    neighbors. Edge direction does not matter for bipartiteness, so for a
+    directed graph it must list the neighbors in both directions.
+
+    Returns:
+    (bytearray, None): The side, 1 or 2, of every vertex if the graph is
+    bipartite. Otherwise (None, list<integer>): the indices around an odd
+    cycle, each joined to the next and the last joined to the first.
+    """
+    color = bytearray(num_vertices) # 0 until colored, then 1 or 2
+    parent = array('i', [-1]) * num_vertices
+    depth = array('i', [0]) * num_vertices
+    queue = array('i', [0]) * num_vertices # every vertex is queued exactly once
+    head = tail = 0
+
+    for root in range(num_vertices):
+        if color[root]:
+            continue
+        color[root] = 1
+        queue[tail] = root
+        tail += 1
+
+        while head < tail:
+            current = queue[head]
+            head += 1
+            current_color = color[current]
+            other_color = 3 - current_color
+            for neighbor in neighbor_indices(current):
+                neighbor_color = color[neighbor]
+                if not neighbor_color:
+                    color[neighbor] = other_color
+                    parent[neighbor] = current
+                    depth[neighbor] = depth[current] + 1
+                    queue[tail] = neighbor
+                    tail += 1
+                elif neighbor_color == current_color:
+                    return None, _odd_cycle(parent, depth, current, neighbor)
+
+    return color, None
+
+
+def _odd_cycle(parent, depth, vertex1, vertex2):
+    """
+    Return the cycle closed by the edge between two vertices of the same
+    color: both BFS tree paths up to their lowest common ancestor, plus the
+    edge. The vertices are at the same depth, so the cycle has odd length.
+    """
+    path1 = [vertex1]
+    path2 = [vertex2]
+    while depth[path1[-1]] > depth[path2[-1]]:
+        path1.append(parent[path1[-1]])
+    while depth[path2[-1]] > depth[path1[-1]]:
+        path2.append(parent[path2[-1]])
+    while path1[-1] != path2[-1]:
+        path1.append(parent[path1[-1]])
+        path2.append(parent[path2[-1]])
+    path2.pop() # the common ancestor is already the last entry of path1
+    path1.reverse()
+    return path1 + path2
+
+
+def symmetric_arrays(offsets, targets, num_vertices):
+    """
+    Return the (offsets, targets) arrays of a directed CSR graph with every
+    edge also stored in the opposite direction.
+    """
+    counts = array('q', [0]) * (num_vertices + 1)
+    for source in range(num_vertices):
+        counts[source + 1] += offsets[source + 1] - offsets[source]
+    for target in targets:
+        counts[target + 1] += 1
+    for i in range(num_vertices):
+        counts[i + 1] += counts[i]
+
+    next_slot = array('q', counts)
+    both_targets = array('i', [0]) * (2 * len(targets))
+    for source in range(num_vertices):
+        for position in range(offsets[source], offsets[source + 1]):
+            target = targets[position]
+            both_targets[next_slot[source]] = target
+            next_slot[source] += 1
+            both_targets[next_slot[target]] = source
+            next_slot[target] += 1
+    return counts, both_targets
@@ -0,0 +1,337 @@
+from array import array
+from collections import deque
+
+from graphs.bipartite import symmetric_arrays, two_color
+
+
+class CSRGraph(object):
+    """ CSRGraph Class
+    An immutable, array-backed (compressed sparse row) form of a Graph.
+
+    Vertex ids are mapped to dense integers 0..n-1. The neighbors of vertex
+    `i` are stored in `targets[offsets[i]:offsets[i + 1]]`, and the matching
+    edge weights, if any, at the same positions in `weights`.
+    """
+    def __init__(self, vertex_ids, offsets, targets, is_directed=True, weights=None):
+        """
+        Initialize a CSR graph from already-built arrays.
+
+        Parameters:
+        vertex_ids (list<string>): The vertex id for each dense index.
+        offsets (array<int>): n + 1 offsets into `targets`.
+        targets (array<int>): The neighbor indices of every vertex, back to back.
+        is_directed (boolean): Whether the graph is directed.
+        weights (array<float>): Optional edge weights, parallel to `targets`.
+        """
+        if len(offsets) != len(vertex_ids) + 1:
+            raise ValueError("offsets must have exactly one more entry than vertex_ids")
+        if weights is not None and len(weights) != len(targets):
+            raise ValueError("weights must have exactly one entry per target")
+
+        self.__vertex_ids = vertex_ids
+        self.__index_of = {vertex_id: i for i, vertex_id in enumerate(vertex_ids)}
+        self.__offsets = offsets
+        self.__targets = targets
+        self.__weights = weights
+        self.__is_directed = is_directed
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Build a CSR graph from a dict-based Graph.
+
+        Parameters:
+        graph (Graph): The graph to freeze.
+
+        Returns:
+        CSRGraph: An immutable copy of `graph`.
+        """
+        vertices = graph.vertices_view()
+        vertex_ids = list(graph.vertex_ids())
+        index_of = {vertex_id: i for i, vertex_id in enumerate(vertex_ids)}
+
+        offsets = array('q', [0])
+        targets = array('i')
+        for vertex in vertices:
+            targets.extend(index_of[neighbor_id] for neighbor_id in vertex.neighbor_ids())
+            offsets.append(len(targets))
+
+        return cls(vertex_ids, offsets, targets, graph.is_directed())
+
+    @classmethod
+    def from_weighted_graph(cls, graph):
+        """
+        Build a weighted CSR graph from a WeightedGraph.
+
+        Parameters:
+        graph (WeightedGraph): The graph to freeze.
+
+        Returns:
+        CSRGraph: An immutable copy of `graph`, including edge weights.
+        """
+        vertices = graph.vertices_view()
+        vertex_ids = list(graph.vertex_ids())
+        index_of = {vertex_id: i for i, vertex_id in enumerate(vertex_ids)}
+
+        offsets = array('q', [0])
+        targets = array('i')
+        weights = array('d')
+        for vertex in vertices:
+            for neighbor_id, weight in vertex.iter_neighbors_with_weights():
+                targets.append(index_of[neighbor_id])
+                weights.append(weight)
+            offsets.append(len(targets))
+
+        return cls(vertex_ids, offsets, targets, graph.is_directed(), weights)
+
+    def __str__(self):
+        """Return a string representation of the graph."""
+        return f'CSRGraph with {self.num_vertices()} vertices and {self.num_edges()} edges'
+
+    def __repr__(self):
+        """Return a string representation of the graph."""
+        return self.__str__()
+
+    def is_directed(self):
+        """Return True if the graph is directed."""
+        return self.__is_directed
+
+    def is_weighted(self):
+        """Return True if the graph stores edge weights."""
+        return self.__weights is not None
+
+    def num_vertices(self):
+        """Return the number of vertices in the graph."""
+        return len(self.__vertex_ids)
+
+    def num_edges(self):
+        """
+        Return the number of stored edges. Undirected edges are stored once in
+        each direction.
+        """
+        return len(self.__targets)
+
+    def contains_id(self, vertex_id):
+        return vertex_id in self.__index_of
+
+    def get_vertices(self):
+        """Return all vertex ids in index order."""
+        return list(self.__vertex_ids)
+
+    def index_of(self, vertex_id):
+        """Return the dense index of `vertex_id`."""
+        return self.__index_of[vertex_id]
+
+    def id_of(self, index):
+        """Return the vertex id stored at dense index `index`."""
+        return self.__vertex_ids[index]
+
+    def neighbor_indices(self, index):
+        """Return the neighbor indices of the vertex at `index`."""
+        return self.__targets[self.__offsets[index]:self.__offsets[index + 1]]
+
+    def get_neighbors(self, vertex_id):
+        """Return the neighbor ids of `vertex_id`."""
+        vertex_ids = self.__vertex_ids
+        return [vertex_ids[i] for i in self.neighbor_indices(self.__index_of[vertex_id])]
+
+    def get_neighbors_with_weights(self, vertex_id):
+        """Return the neighbors of `vertex_id` as a list of tuples of (neighbor_id, weight)."""
+        if self.__weights is None:
+            raise ValueError("The graph is not weighted!")
+        index = self.__index_of[vertex_id]
+        start, end = self.__offsets[index], self.__offsets[index + 1]
+        vertex_ids = self.__vertex_ids
+        return [(vertex_ids[i], weight)
+                for i, weight in zip(self.__targets[start:end], self.__weights[start:end])]
+
+    def arrays(self):
+        """Return the underlying (vertex_ids, offsets, targets) without copying."""
+        return self.__vertex_ids, self.__offsets, self.__targets
+
+    def edge_weights(self):
+        """Return the weights parallel to `targets`, or None if unweighted."""
+        return self.__weights
+
+    def __check_ids(self, *vertex_ids):
+        for vertex_id in vertex_ids:
+            if vertex_id not in self.__index_of:
+                raise KeyError("One or both vertices are not in the graph!")
+
+    def bfs_traversal(self, start_id):
+        """
+        Traverse the graph using breadth-first search.
+
+        Returns:
+        list<string>: The vertex ids in the order they were visited.
+        """
+        self.__check_ids(start_id)
+        offsets, targets = self.__offsets, self.__targets
+
+        start = self.__index_of[start_id]
+        seen = bytearray(len(self.__vertex_ids))
+        seen[start] = 1
+        order = [start]
+        queue = deque(order)
+
+        while queue:
+            current = queue.popleft()
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if not seen[neighbor]:
+                    seen[neighbor] = 1
+                    order.append(neighbor)
+                    queue.append(neighbor)
+
+        vertex_ids = self.__vertex_ids
+        return [vertex_ids[i] for i in order]
+
+    def find_shortest_path(self, start_id, target_id):
+        """
+        Find and return the shortest path from start_id to target_id.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        target_id (string): The id of the target (end) vertex.
+
+        Returns:
+        list<string>: A list of all vertex ids in the shortest path, from start to end.
+        """
+        self.__check_ids(start_id, target_id)
+        offsets, targets = self.__offsets, self.__targets
+
+        start = self.__index_of[start_id]
+        target = self.__index_of[target_id]
+        parent = array('i', [-1]) * len(self.__vertex_ids)
+        parent[start] = start
+        queue = deque([start])
+
+        while queue and parent[target] == -1:
+            current = queue.popleft()
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if parent[neighbor] == -1:
+                    parent[neighbor] = current
+                    queue.append(neighbor)
+
+        if parent[target] == -1: # path not found
+            return None
+
+        path = [target]
+        while path[-1] != start:
+            path.append(parent[path[-1]])
+        vertex_ids = self.__vertex_ids
+        return [vertex_ids[i] for i in reversed(path)]
+
+    def find_vertices_n_away(self, start_id, target_distance):
+        """
+        Find and return all vertices n distance away.
+
+        Arguments:
+        start_id (string): The id of the start vertex.
+        target_distance (integer): The distance from the start vertex we are looking for
+
+        Returns:
+        list<string>: All vertex ids that are `target_distance` away from the start vertex
+        """
+        self.__check_ids(start_id)
+        offsets, targets = self.__offsets, self.__targets
+
+        seen = bytearray(len(self.__vertex_ids))
+        start = self.__index_of[start_id]
+        seen[start] = 1
+        frontier = [start]
+
+        for _ in range(target_distance):
+            next_frontier = []
+            for current in frontier:
+                for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                    if not seen[neighbor]:
+                        seen[neighbor] = 1
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+            if not frontier:
+                break
+
+        vertex_ids = self.__vertex_ids
+        return [vertex_ids[i] for i in frontier]
+
+    def bipartition(self):
+        """
+        Split the vertices into two sides with no edge inside either side.
+        Edge direction is ignored and every component is checked.
+
+        Returns:
+        ((list<string>, list<string>), None): The two sides, if the graph is
+        bipartite. Otherwise (None, list<string>): the vertex ids around an
+        odd cycle, which proves it is not.
+        """
+        vertex_ids = self.__vertex_ids
+        offsets, targets = self.__offsets, self.__targets
+        if self.__is_directed:
+            offsets, targets = symmetric_arrays(offsets, targets, len(vertex_ids))
+
+        color, odd_cycle = two_color(
+            len(vertex_ids), lambda i: targets[offsets[i]:offsets[i + 1]])
+        if odd_cycle is not None:
+            return None, [vertex_ids[i] for i in odd_cycle]
+        left = [vertex_id for vertex_id, side in zip(vertex_ids, color) if side == 1]
+        right = [vertex_id for vertex_id, side in zip(vertex_ids, color) if side == 2]
+        return (left, right), None
+
+    def is_bipartite(self):
+        """
+        Return True if the graph is bipartite, and False otherwise.
+        Every component is checked.
+        """
+        return self.bipartition()[1] is None
+
+    def find_connected_components(self):
+        """
+        Return a list of all connected components, with each connected component
+        represented as a list of vertex ids. Edge direction is ignored.
+        """
+        offsets, targets = self.__offsets, self.__targets
+        parent = array('i', range(len(self.__vertex_ids)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for current in range(len(self.__vertex_ids)):
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                root1, root2 = find(current), find(neighbor)
+                if root1 != root2:
+                    parent[root1] = root2
+
+        components = {}
+        for i, vertex_id in enumerate(self.__vertex_ids):
+            components.setdefault(find(i), []).append(vertex_id)
+        return list(components.values())
+
+    def topological_sort(self):
+        """
+        Return a valid ordering of vertices in a directed acyclic graph.
+        If the graph contains a cycle, throw a ValueError.
+        """
+        offsets, targets = self.__offsets, self.__targets
+        indegree = array('i', [0]) * len(self.__vertex_ids)
+        for neighbor in targets:
+            indegree[neighbor] += 1
+
+        indeg0 = [i for i, degree in enumerate(indegree) if degree == 0]
+        sorted_list = []
+
+        while indeg0:
+            current = indeg0.pop()
+            sorted_list.append(current)
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                indegree[neighbor] -= 1
+                if indegree[neighbor] == 0:
+                    indeg0.append(neighbor)
+
+        if len(sorted_list) != len(self.__vertex_ids):
+            raise ValueError("The graph contains a cycle!")
+
+        vertex_ids = self.__vertex_ids
+        return [vertex_ids[i] for i in sorted_list]
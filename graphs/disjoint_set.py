@@ -0,0 +1,87 @@
+class DisjointSet(object):
+    """ DisjointSet Class
+    A union-find structure over arbitrary hashable items, with path
+    compression and union by size.
+    """
+    def __init__(self, items=()):
+        """
+        Initialize a disjoint set where every item starts in its own group.
+
+        Parameters:
+        items (iterable): The initial items.
+        """
+        self.__parent = {} # item -> parent item
+        self.__size = {} # root item -> number of items in its group
+        self.__count = 0
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        """Return the number of items."""
+        return len(self.__parent)
+
+    def __contains__(self, item):
+        return item in self.__parent
+
+    def add(self, item):
+        """Add `item` in its own group, if it is not already present."""
+        if item not in self.__parent:
+            self.__parent[item] = item
+            self.__size[item] = 1
+            self.__count += 1
+
+    def find(self, item):
+        """Get the root (or, group label) for `item`."""
+        parent = self.__parent
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+
+        # point everything on the path straight at the root
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    def union(self, item1, item2):
+        """
+        Combine the groups of `item1` and `item2`.
+
+        Returns:
+        boolean: True if the groups were different and have been merged.
+        """
+        root1 = self.find(item1)
+        root2 = self.find(item2)
+        if root1 == root2:
+            return False
+
+        size = self.__size
+        if size[root1] < size[root2]:
+            root1, root2 = root2, root1
+        self.__parent[root2] = root1
+        size[root1] += size.pop(root2)
+        self.__count -= 1
+        return True
+
+    def connected(self, item1, item2):
+        """Return True if `item1` and `item2` are in the same group."""
+        return self.find(item1) == self.find(item2)
+
+    def count(self):
+        """Return the number of groups."""
+        return self.__count
+
+    def group_size(self, item):
+        """Return the number of items in the group of `item`."""
+        return self.__size[self.find(item)]
+
+    def groups(self):
+        """
+        Return every group.
+
+        Returns:
+        list<list>: The items of each group.
+        """
+        groups = {}
+        for item in self.__parent:
+            groups.setdefault(self.find(item), []).append(item)
+        return list(groups.values())
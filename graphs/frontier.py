@@ -0,0 +1,106 @@
+try:
+    import numpy as np
+except ImportError: # NumPy is optional; only FrontierBFS needs it
+    np = None
+
+
+class FrontierBFS(object):
+    """ FrontierBFS Class
+    Level-synchronous breadth-first search over a CSRGraph, expanding a whole
+    frontier at a time with NumPy array operations instead of one vertex at a
+    time in Python.
+    """
+    def __init__(self, graph):
+        """
+        Wrap a frozen graph. The CSR arrays are shared with `graph`, not copied.
+
+        Parameters:
+        graph (CSRGraph): The graph to search, e.g. from `Graph.freeze()`.
+        """
+        if np is None:
+            raise ImportError("FrontierBFS requires NumPy")
+
+        vertex_ids, offsets, targets = graph.arrays()
+        self.__graph = graph
+        self.__vertex_ids = vertex_ids
+        self.__offsets = np.frombuffer(offsets, dtype=np.int64)
+        self.__targets = np.frombuffer(targets, dtype=np.int32)
+
+    def __indices(self, start_ids):
+        graph = self.__graph
+        for start_id in start_ids:
+            if not graph.contains_id(start_id):
+                raise KeyError("Vertex is not in the graph!")
+        return np.unique(np.array([graph.index_of(start_id) for start_id in start_ids],
+                                  dtype=np.int64))
+
+    def __ids(self, indices):
+        vertex_ids = self.__vertex_ids
+        return [vertex_ids[i] for i in indices.tolist()]
+
+    def __expand(self, frontier, visited):
+        """Return the unvisited neighbors of every vertex in `frontier`, and mark them visited."""
+        starts = self.__offsets[frontier]
+        lengths = self.__offsets[frontier + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return frontier[:0]
+
+        # positions of every neighbor of the frontier in `targets`, back to back
+        shift = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        neighbors = self.__targets[np.arange(total, dtype=np.int64) + shift]
+
+        neighbors = np.unique(neighbors[~visited[neighbors]]).astype(np.int64)
+        visited[neighbors] = True
+        return neighbors
+
+    def __levels(self, start_ids, k):
+        """Yield the frontier at each distance 0..k from the start vertices."""
+        if k < 0:
+            raise ValueError("k must not be negative")
+
+        frontier = self.__indices(start_ids)
+        visited = np.zeros(len(self.__vertex_ids), dtype=bool)
+        visited[frontier] = True
+        yield frontier
+        for _ in range(k):
+            frontier = self.__expand(frontier, visited)
+            yield frontier
+            if len(frontier) == 0:
+                return
+
+    def multi_source_k_hop(self, start_ids, k):
+        """
+        Return the vertex ids whose distance to the nearest start vertex is
+        exactly `k`.
+        """
+        for distance, frontier in enumerate(self.__levels(start_ids, k)):
+            pass
+        return self.__ids(frontier) if distance == k else []
+
+    def multi_source_k_hop_ball(self, start_ids, k):
+        """
+        Return the vertex ids at distance at most `k` from any start vertex,
+        including the start vertices themselves.
+        """
+        levels = list(self.__levels(start_ids, k))
+        return self.__ids(np.concatenate(levels))
+
+    def k_hop(self, start_id, k):
+        """Return the vertex ids exactly `k` edges away from `start_id`."""
+        return self.multi_source_k_hop([start_id], k)
+
+    def k_hop_ball(self, start_id, k):
+        """Return the vertex ids at most `k` edges away from `start_id`, including it."""
+        return self.multi_source_k_hop_ball([start_id], k)
+
+    def distances(self, start_ids, k):
+        """
+        Return a dict of vertex id -> distance from the nearest start vertex,
+        for every vertex at most `k` edges away.
+        """
+        result = {}
+        for distance, frontier in enumerate(self.__levels(start_ids, k)):
+            for vertex_id in self.__ids(frontier):
+                result[vertex_id] = distance
+        return result
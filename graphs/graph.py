@@ -1,9 +1,38 @@
-from collections import deque
+import gc
+import sys
+from array import array
+from collections import Counter, deque
+from contextlib import contextmanager
+
+from graphs import batch_queries
+from graphs.csr_graph import CSRGraph
+from graphs.disjoint_set import DisjointSet
+from graphs.query_cache import QueryCache, cached_query
+from graphs.reachability import ReachabilityIndex
+from graphs.scc import strongly_connected_components
+from graphs.topological_order import TopologicalOrder
+
+@contextmanager
+def gc_paused():
+    """
+    Turn off the cyclic garbage collector for a bulk build. Creating millions
+    of vertices otherwise triggers collections that rescan every object made
+    so far, which costs about as much as the build itself.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
 
 class Vertex(object):
     """
     Defines a single vertex and its neighbors.
     """
+    __slots__ = ('__id', '__neighbors_dict')
 
     def __init__(self, vertex_id):
         """
@@ -38,24 +67,350 @@ class Vertex(object):
         """Return the neighbors of this vertex."""
         return list(self.__neighbors_dict.values())
 
+    def iter_neighbors(self):
+        """Return an iterator over the neighbor objects, without building a list."""
+        return iter(self.__neighbors_dict.values())
+
+    def neighbor_ids(self):
+        """
+        Return a read-only, live view of the neighbor ids. It supports fast
+        `in` checks and must not be iterated while the vertex is being changed.
+        """
+        return self.__neighbors_dict.keys()
+
+    def has_neighbor(self, vertex_id):
+        """Return True if there is an edge from this vertex to `vertex_id`."""
+        return vertex_id in self.__neighbors_dict
+
+    def degree(self):
+        """Return the number of neighbors of this vertex."""
+        return len(self.__neighbors_dict)
+
+    def get_id(self):
+        """Return the id of this vertex."""
+        return self.__id
+
+    def memory_usage(self):
+        """Return the number of bytes used by this vertex and its neighbor storage."""
+        return sys.getsizeof(self) + sys.getsizeof(self.__neighbors_dict)
+
+
+class CompactVertex(object):
+    """
+    A memory-lean vertex for `Graph(compact=True)`. Neighbors are kept as a
+    packed array of the dense integer indices the graph assigns to each vertex
+    id (4 bytes per edge), instead of a dictionary keyed by the full id.
+
+    Adding an edge just appends to the array. Repeated edges are dropped in
+    one pass the next time the neighbors are read, so building a hub stays
+    linear in its degree. Checking for one particular edge scans the array.
+    """
+    __slots__ = ('__id', '__index', '__neighbor_indices', '__has_repeats', '__vertex_list',
+                 '__vertex_dict')
+
+    def __init__(self, vertex_id, index, vertex_list, vertex_dict):
+        """
+        Initialize a vertex with no neighbors.
+
+        Parameters:
+        vertex_id (string): A unique identifier to identify this vertex.
+        index (integer): The dense index of this vertex in its graph.
+        vertex_list (list<CompactVertex>): The graph's index -> vertex table.
+        vertex_dict (dict): The graph's id -> vertex table.
+        """
+        self.__id = vertex_id
+        self.__index = index
+        self.__neighbor_indices = array('i')
+        self.__has_repeats = False # set on insert, cleared when repeats are dropped
+        self.__vertex_list = vertex_list
+        self.__vertex_dict = vertex_dict
+
+    def add_neighbor(self, vertex_obj):
+        """
+        Add a neighbor by storing its index.
+
+        Parameters:
+        vertex_obj (CompactVertex): A vertex of the same graph.
+        """
+        self.__neighbor_indices.append(vertex_obj.__index)
+        self.__has_repeats = True
+
+    def __indices(self):
+        """Return the neighbor indices, dropping repeated edges first if needed."""
+        if self.__has_repeats:
+            self.__neighbor_indices = array('i', dict.fromkeys(self.__neighbor_indices))
+            self.__has_repeats = False
+        return self.__neighbor_indices
+
+    def __str__(self):
+        """Output the list of neighbors of this vertex."""
+        return f'{self.__id} adjacent to {list(self.neighbor_ids())}'
+
+    def __repr__(self):
+        """Output the list of neighbors of this vertex."""
+        return self.__str__()
+
+    def get_neighbors(self):
+        """Return the neighbors of this vertex."""
+        vertex_list = self.__vertex_list
+        return [vertex_list[i] for i in self.__indices()]
+
+    def iter_neighbors(self):
+        """Return an iterator over the neighbor objects, without building a list."""
+        return map(self.__vertex_list.__getitem__, self.__indices())
+
+    def neighbor_ids(self):
+        """
+        Return a read-only, live view of the neighbor ids. It supports fast
+        `in` checks and must not be iterated while the vertex is being changed.
+        """
+        return _NeighborIdView(self)
+
+    def neighbor_indices(self):
+        """Return the live array of neighbor indices. It must not be modified."""
+        return self.__indices()
+
+    def has_neighbor(self, vertex_id):
+        """Return True if there is an edge from this vertex to `vertex_id`."""
+        vertex = self.__vertex_dict.get(vertex_id)
+        return vertex is not None and vertex.__index in self.__neighbor_indices
+
+    def degree(self):
+        """Return the number of neighbors of this vertex."""
+        return len(self.__indices())
+
     def get_id(self):
         """Return the id of this vertex."""
         return self.__id
 
+    def get_index(self):
+        """Return the dense index of this vertex in its graph."""
+        return self.__index
+
+    def memory_usage(self):
+        """Return the number of bytes used by this vertex and its neighbor storage."""
+        return sys.getsizeof(self) + sys.getsizeof(self.__indices())
+
+    def _vertex_list(self):
+        return self.__vertex_list
+
+    def _set_neighbor_indices(self, indices):
+        self.__neighbor_indices = indices
+        self.__has_repeats = False
+
+
+class _NeighborIdView(object):
+    """The neighbor ids of a CompactVertex, computed on the fly from its indices."""
+    __slots__ = ('__vertex',)
+
+    def __init__(self, vertex):
+        self.__vertex = vertex
+
+    def __len__(self):
+        return self.__vertex.degree()
+
+    def __contains__(self, vertex_id):
+        return self.__vertex.has_neighbor(vertex_id)
+
+    def __iter__(self):
+        vertex_list = self.__vertex._vertex_list()
+        for i in self.__vertex.neighbor_indices():
+            yield vertex_list[i].get_id()
+
 
 class Graph:
     """ Graph Class
     Represents a directed or undirected graph.
     """
-    def __init__(self, is_directed=True):
+    def __init__(self, is_directed=True, query_cache_size=0, track_components=False,
+                 compact=False, track_topological_order=False, index_in_neighbors=False,
+                 track_reachability=False):
         """
         Initialize a graph object with an empty vertex dictionary.
 
         Parameters:
         is_directed (boolean): Whether the graph is directed (edges go in only one direction).
+        query_cache_size (integer): How many query results to memoize. 0 turns
+        the query cache off.
+        track_components (boolean): Keep the connected components up to date on
+        every insert. Only supported on undirected graphs.
+        compact (boolean): Intern vertex ids to dense integers and use the
+        memory-lean CompactVertex.
+        track_topological_order (boolean): Keep a topological order up to date
+        on every insert, and reject edges that would create a cycle. Only
+        supported on directed graphs.
+        index_in_neighbors (boolean): Keep an index of the edges into each
+        vertex, for O(1) in-degrees and backward searches. Always on when
+        tracking the topological order. Undirected graphs need no index,
+        since every neighbor is also an in-neighbor.
+        track_reachability (boolean): Keep a ReachabilityIndex up to date on
+        every insert, for constant-time `reachable` queries. Only supported on
+        directed graphs.
         """
+        if track_components and is_directed:
+            raise ValueError("Component tracking is only supported on undirected graphs!")
+        if track_topological_order and not is_directed:
+            raise ValueError("Topological order tracking is only supported on directed graphs!")
+        if track_reachability and not is_directed:
+            raise ValueError("Reachability tracking is only supported on directed graphs!")
+
         self.__vertex_dict = {} # id -> object
         self.__is_directed = is_directed
+        self.__version = 0
+        self.__query_cache = QueryCache(query_cache_size) if query_cache_size else None
+        self.__components = DisjointSet() if track_components else None
+        self.__vertex_list = [] if compact else None # index -> object
+        self.__in_neighbors = None # id -> dict of in-neighbor ids, used as an ordered set
+        self.__topological_order = None
+        if is_directed and (index_in_neighbors or track_topological_order):
+            self.__in_neighbors = {}
+        if track_topological_order:
+            self.__topological_order = TopologicalOrder(self.__neighbor_ids,
+                                                        self.__in_neighbor_ids)
+        self.__reachability = None
+        if track_reachability:
+            self.__reachability = ReachabilityIndex(self.__vertex_dict, self.__neighbor_ids)
+
+    @classmethod
+    def from_edges(cls, edges, directed=True, vertex_ids=(), **options):
+        """
+        Build a graph from an edge list in one pass. Vertices are created the
+        first time they are seen, and repeated edges are dropped.
+
+        Parameters:
+        edges (iterable<(string, string)>): Pairs of (vertex_id1, vertex_id2).
+        directed (boolean): Whether the graph is directed.
+        vertex_ids (iterable<string>): Vertices to add first, e.g. ones with no
+        edges. They come first in the graph's vertex order.
+        options: Passed on to Graph(), e.g. compact=True.
+
+        Returns:
+        Graph: The new graph.
+        """
+        graph = cls(is_directed=directed, **options)
+        with gc_paused():
+            for vertex_id in vertex_ids:
+                if vertex_id not in graph.__vertex_dict:
+                    graph.add_vertex(vertex_id)
+            if graph.__vertex_list is not None:
+                graph.__load_compact_edges(edges)
+            else:
+                graph.__load_edges(edges)
+            graph.__rebuild_indexes()
+        return graph
+
+    @classmethod
+    def from_adjacency(cls, adjacency, directed=True, **options):
+        """
+        Build a graph from an adjacency mapping in one pass.
+
+        Parameters:
+        adjacency (dict<string, iterable<string>>): Maps each vertex id to the
+        ids of its neighbors. Neighbors missing from the keys are created.
+        directed (boolean): Whether the graph is directed.
+        options: Passed on to Graph(), e.g. compact=True.
+
+        Returns:
+        Graph: The new graph.
+        """
+        edges = ((vertex_id, neighbor_id)
+                 for vertex_id, neighbor_ids in adjacency.items()
+                 for neighbor_id in neighbor_ids)
+        return cls.from_edges(edges, directed, vertex_ids=adjacency, **options)
+
+    def __load_edges(self, edges):
+        vertex_dict = self.__vertex_dict
+        is_directed = self.__is_directed
+        components = self.__components
+        try:
+            for vertex_id1, vertex_id2 in edges:
+                vertex1 = vertex_dict.get(vertex_id1)
+                if vertex1 is None:
+                    vertex1 = vertex_dict[vertex_id1] = Vertex(vertex_id1)
+                    if components is not None:
+                        components.add(vertex_id1)
+                vertex2 = vertex_dict.get(vertex_id2)
+                if vertex2 is None:
+                    vertex2 = vertex_dict[vertex_id2] = Vertex(vertex_id2)
+                    if components is not None:
+                        components.add(vertex_id2)
+                # the neighbors are a dict, so repeated edges just overwrite
+                vertex1.add_neighbor(vertex2)
+                if not is_directed:
+                    vertex2.add_neighbor(vertex1)
+                if components is not None:
+                    components.union(vertex_id1, vertex_id2)
+        finally:
+            self.__version += 1
+
+    def __load_compact_edges(self, edges):
+        """
+        Intern every edge to a pair of indices, then lay each vertex's
+        neighbors out with a counting sort and drop repeats per vertex, so
+        each neighbor array is written once, already free of repeats, instead
+        of being appended to per edge and deduplicated on the first read.
+        """
+        vertex_list = self.__vertex_list
+        components = self.__components
+        index_of = {vertex.get_id(): vertex.get_index() for vertex in vertex_list}
+        sources = array('i')
+        targets = array('i')
+        for vertex_id1, vertex_id2 in edges:
+            index1 = index_of.get(vertex_id1)
+            if index1 is None:
+                index1 = index_of[vertex_id1] = self.__new_compact_vertex(vertex_id1)
+            index2 = index_of.get(vertex_id2)
+            if index2 is None:
+                index2 = index_of[vertex_id2] = self.__new_compact_vertex(vertex_id2)
+            sources.append(index1)
+            targets.append(index2)
+            if components is not None:
+                components.union(vertex_id1, vertex_id2)
+        if not self.__is_directed:
+            sources, targets = sources + targets, targets + sources
+
+        num_vertices = len(vertex_list)
+        counts = Counter(sources)
+        offsets = array('q', [0]) * (num_vertices + 1)
+        for i in range(num_vertices):
+            offsets[i + 1] = offsets[i] + counts[i]
+        next_slot = array('q', offsets)
+        grouped = array('i', [0]) * len(targets)
+        for source, target in zip(sources, targets):
+            grouped[next_slot[source]] = target
+            next_slot[source] += 1
+
+        for i, vertex in enumerate(vertex_list):
+            start, end = offsets[i], offsets[i + 1]
+            if end - start:
+                vertex._set_neighbor_indices(array('i', dict.fromkeys(grouped[start:end])))
+        self.__version += 1
+
+    def __rebuild_indexes(self):
+        """Recompute the in-neighbor index and topological order after a bulk load."""
+        if self.__in_neighbors is not None:
+            in_neighbors = self.__in_neighbors
+            for vertex_id in self.__vertex_dict:
+                in_neighbors[vertex_id] = {}
+            for vertex_id in self.__vertex_dict:
+                for neighbor_id in self.__neighbor_ids(vertex_id):
+                    in_neighbors[neighbor_id][vertex_id] = None
+        if self.__topological_order is not None:
+            self.__topological_order = TopologicalOrder(self.__neighbor_ids,
+                                                        self.__in_neighbor_ids,
+                                                        self.__kahn_order())
+        if self.__reachability is not None:
+            self.__reachability.rebuild()
+
+    def __new_compact_vertex(self, vertex_id):
+        """Add a vertex with no neighbors in compact mode and return its index."""
+        index = len(self.__vertex_list)
+        vertex = CompactVertex(vertex_id, index, self.__vertex_list, self.__vertex_dict)
+        self.__vertex_list.append(vertex)
+        self.__vertex_dict[vertex_id] = vertex
+        if self.__components is not None:
+            self.__components.add(vertex_id)
+        return index
 
     def add_vertex(self, vertex_id):
         """
@@ -67,8 +422,32 @@ class Graph:
         Returns:
         Vertex: The new vertex object.
         """
-        new_vertex = Vertex(vertex_id)
+        if self.__vertex_list is None:
+            new_vertex = Vertex(vertex_id)
+        elif vertex_id in self.__vertex_dict:
+            # replace the vertex but keep its index
+            index = self.__vertex_dict[vertex_id].get_index()
+            new_vertex = CompactVertex(vertex_id, index, self.__vertex_list, self.__vertex_dict)
+            self.__vertex_list[index] = new_vertex
+        else:
+            new_vertex = CompactVertex(vertex_id, len(self.__vertex_list),
+                                       self.__vertex_list, self.__vertex_dict)
+            self.__vertex_list.append(new_vertex)
+        old_vertex = self.__vertex_dict.get(vertex_id)
         self.__vertex_dict[vertex_id] = new_vertex
+        if self.__components is not None:
+            self.__components.add(vertex_id)
+        if self.__in_neighbors is not None:
+            if old_vertex is not None:
+                # the replaced vertex's edges are gone
+                for neighbor_id in old_vertex.neighbor_ids():
+                    self.__in_neighbors[neighbor_id].pop(vertex_id, None)
+            self.__in_neighbors.setdefault(vertex_id, {})
+        if self.__topological_order is not None:
+            self.__topological_order.add_vertex(vertex_id)
+        if self.__reachability is not None:
+            self.__reachability.add_vertex(vertex_id)
+        self.__version += 1
         return new_vertex
         
 
@@ -88,10 +467,54 @@ class Graph:
         vertex_id1 (string): The unique identifier of the first vertex.
         vertex_id2 (string): The unique identifier of the second vertex.
         """
+        if vertex_id1 not in self.__vertex_dict or vertex_id2 not in self.__vertex_dict:
+            raise KeyError("One or both vertices are not in the graph!")
+        if self.__topological_order is not None:
+            self.__topological_order.add_edge(vertex_id1, vertex_id2)
         self.__vertex_dict[vertex_id1].add_neighbor(self.__vertex_dict[vertex_id2])
         if not self.__is_directed:
             self.__vertex_dict[vertex_id2].add_neighbor(self.__vertex_dict[vertex_id1])
-        pass
+        if self.__in_neighbors is not None:
+            self.__in_neighbors[vertex_id2][vertex_id1] = None
+        if self.__reachability is not None:
+            self.__reachability.add_edge(vertex_id1, vertex_id2)
+        if self.__components is not None:
+            self.__components.union(vertex_id1, vertex_id2)
+        self.__version += 1
+
+    def add_edges(self, edges):
+        """
+        Add many edges at once. The edges are consumed lazily, so `edges` may be
+        a generator over a file that does not fit in memory.
+
+        Parameters:
+        edges (iterable<(string, string)>): Pairs of (vertex_id1, vertex_id2).
+        """
+        vertex_dict = self.__vertex_dict
+        is_directed = self.__is_directed
+        union = self.__components.union if self.__components is not None else None
+        in_neighbors = self.__in_neighbors
+        order = self.__topological_order
+        reachability = self.__reachability
+        try:
+            for vertex_id1, vertex_id2 in edges:
+                vertex1 = vertex_dict[vertex_id1]
+                vertex2 = vertex_dict[vertex_id2]
+                if order is not None:
+                    order.add_edge(vertex_id1, vertex_id2)
+                vertex1.add_neighbor(vertex2)
+                if not is_directed:
+                    vertex2.add_neighbor(vertex1)
+                if union is not None:
+                    union(vertex_id1, vertex_id2)
+                if in_neighbors is not None:
+                    in_neighbors[vertex_id2][vertex_id1] = None
+                if reachability is not None:
+                    reachability.add_edge(vertex_id1, vertex_id2)
+        except KeyError as error:
+            raise KeyError(f"Vertex {error.args[0]!r} is not in the graph!") from None
+        finally:
+            self.__version += 1
         
     def get_vertices(self):
         """
@@ -102,9 +525,120 @@ class Graph:
         """
         return list(self.__vertex_dict.values())
 
+    def vertices_view(self):
+        """
+        Return a read-only, live view of the vertex objects, without building a
+        list. It must not be iterated while vertices are being added.
+        """
+        return self.__vertex_dict.values()
+
+    def vertex_ids(self):
+        """Return a read-only, live view of the vertex ids."""
+        return self.__vertex_dict.keys()
+
+    def num_vertices(self):
+        """Return the number of vertices in the graph."""
+        return len(self.__vertex_dict)
+
     def contains_id(self, vertex_id):
         return vertex_id in self.__vertex_dict
 
+    def is_directed(self):
+        """Return True if the graph is directed."""
+        return self.__is_directed
+
+    def has_in_neighbor_index(self):
+        """Return True if in-neighbors can be looked up without scanning every edge."""
+        return self.__in_neighbors is not None or not self.__is_directed
+
+    def get_in_neighbors(self, vertex_id):
+        """
+        Return the ids of the vertices with an edge into `vertex_id`.
+        Directed graphs need `index_in_neighbors`.
+        """
+        if vertex_id not in self.__vertex_dict:
+            raise KeyError("Vertex is not in the graph!")
+        return list(self.__require_in_neighbors()(vertex_id))
+
+    def in_degree(self, vertex_id):
+        """
+        Return the number of edges into `vertex_id`, in O(1).
+        Directed graphs need `index_in_neighbors`.
+        """
+        if vertex_id not in self.__vertex_dict:
+            raise KeyError("Vertex is not in the graph!")
+        return len(self.__require_in_neighbors()(vertex_id))
+
+    def out_degree(self, vertex_id):
+        """Return the number of edges out of `vertex_id`, in O(1)."""
+        if vertex_id not in self.__vertex_dict:
+            raise KeyError("Vertex is not in the graph!")
+        return self.__vertex_dict[vertex_id].degree()
+
+    def __require_in_neighbors(self):
+        """Return a function that maps a vertex id to its in-neighbor ids."""
+        if not self.__is_directed:
+            return self.__neighbor_ids
+        if self.__in_neighbors is None:
+            raise ValueError("The in-neighbor index is off; create the graph with index_in_neighbors=True")
+        return self.__in_neighbor_ids
+
+    def is_compact(self):
+        """Return True if the graph uses interned integer ids and CompactVertex."""
+        return self.__vertex_list is not None
+
+    def memory_usage(self):
+        """
+        Estimate the memory used by the graph's vertices and edges.
+
+        Returns:
+        dict: The number of vertices and stored edges, and the bytes used by
+        the vertex objects with their neighbor storage, the lookup tables and
+        the id strings, plus their total.
+        """
+        vertex_dict = self.__vertex_dict
+        vertex_bytes = sum(vertex.memory_usage() for vertex in vertex_dict.values())
+        table_bytes = sys.getsizeof(vertex_dict)
+        if self.__vertex_list is not None:
+            table_bytes += sys.getsizeof(self.__vertex_list)
+        if self.__in_neighbors is not None:
+            table_bytes += sys.getsizeof(self.__in_neighbors) + sum(
+                sys.getsizeof(in_neighbors) for in_neighbors in self.__in_neighbors.values())
+        id_bytes = sum(sys.getsizeof(vertex_id) for vertex_id in vertex_dict)
+
+        return {
+            'vertices': len(vertex_dict),
+            'edges': sum(vertex.degree() for vertex in vertex_dict.values()),
+            'vertex_bytes': vertex_bytes,
+            'table_bytes': table_bytes,
+            'id_bytes': id_bytes,
+            'total_bytes': vertex_bytes + table_bytes + id_bytes,
+        }
+
+    def get_version(self):
+        """Return the mutation counter, which goes up on every change to the graph."""
+        return self.__version
+
+    def get_query_cache(self):
+        """Return the QueryCache used for this graph, or None if caching is off."""
+        return self.__query_cache
+
+    def query_cache_stats(self):
+        """Return the hit, miss and eviction counters of the query cache, or None."""
+        if self.__query_cache is None:
+            return None
+        return self.__query_cache.stats()
+
+    @cached_query
+    def freeze(self):
+        """
+        Return an immutable, array-backed copy of this graph.
+
+        Returns:
+        CSRGraph: A compressed sparse row form of the graph.
+        """
+        return CSRGraph.from_graph(self)
+
     def __str__(self):
         """Return a string representation of the graph."""
         return f'Graph with vertices: {self.get_vertices()}'
@@ -116,40 +650,131 @@ class Graph:
     def bfs_traversal(self, start_id):
         """
         Traverse the graph using breadth-first search.
+
+        Returns:
+        list<string>: The vertex ids in the order they were visited.
+        """
+        return list(self.iter_bfs(start_id))
+
+    def iter_bfs(self, start_id, with_details=False, on_discover=None, on_edge=None,
+                 on_finish=None, reverse=False):
+        """
+        Lazily traverse the graph using breadth-first search. Stop iterating at
+        any time to end the traversal early.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        with_details (boolean): Yield (vertex_id, depth, parent_id) tuples
+        instead of bare vertex ids. The start vertex has parent None.
+        on_discover (function): Called as on_discover(vertex_id, depth, parent_id)
+        when a vertex is first seen.
+        on_edge (function): Called as on_edge(vertex_id, neighbor_id) for every
+        edge followed.
+        on_finish (function): Called as on_finish(vertex_id) once all of a
+        vertex's edges have been followed.
+        reverse (boolean): Follow edges backwards, visiting every vertex that
+        can reach the start. Directed graphs need `index_in_neighbors`.
+
+        Yields:
+        string: The vertex ids in the order they are visited.
         """
         if not self.contains_id(start_id):
             raise KeyError("One or both vertices are not in the graph!")
+        neighbor_ids = self.__require_in_neighbors() if reverse else self.__neighbor_ids
 
-        # Keep a set to denote which vertices we've seen before
-        seen = set()
-        seen.add(start_id)
+        # vertex ids we've seen before -> (depth, parent id)
+        seen = {start_id: (0, None)}
+        if on_discover is not None:
+            on_discover(start_id, 0, None)
 
         # Keep a queue so that we visit vertices in the appropriate order
         queue = deque()
-        queue.append(self.get_vertex(start_id))
+        queue.append(start_id)
 
         while queue:
-            current_vertex_obj = queue.pop()
-            current_vertex_id = current_vertex_obj.get_id()
-
-            # Process current node
-            print('Processing vertex {}'.format(current_vertex_id))
+            current_id = queue.popleft()
+            depth, parent_id = seen[current_id]
+            yield (current_id, depth, parent_id) if with_details else current_id
 
             # Add its neighbors to the queue
-            for neighbor in current_vertex_obj.get_neighbors():
-                if neighbor.get_id() not in seen:
-                    seen.add(neighbor.get_id())
-                    queue.append(neighbor)
+            for neighbor_id in neighbor_ids(current_id):
+                if on_edge is not None:
+                    on_edge(current_id, neighbor_id)
+                if neighbor_id not in seen:
+                    seen[neighbor_id] = (depth + 1, current_id)
+                    if on_discover is not None:
+                        on_discover(neighbor_id, depth + 1, current_id)
+                    queue.append(neighbor_id)
+
+            if on_finish is not None:
+                on_finish(current_id)
+
+    def iter_dfs(self, start_id, with_details=False, on_discover=None, on_edge=None,
+                 on_finish=None):
+        """
+        Lazily traverse the graph using depth-first search, yielding vertices
+        in pre-order. Uses an explicit stack, so deep graphs do not hit the
+        recursion limit. Stop iterating at any time to end the traversal early.
 
-        return # everything has been processed
+        Parameters:
+        start_id (string): The id of the start vertex.
+        with_details (boolean): Yield (vertex_id, depth, parent_id) tuples
+        instead of bare vertex ids. The start vertex has parent None.
+        on_discover (function): Called as on_discover(vertex_id, depth, parent_id)
+        when a vertex is first seen.
+        on_edge (function): Called as on_edge(vertex_id, neighbor_id) for every
+        edge followed.
+        on_finish (function): Called as on_finish(vertex_id) once everything
+        reachable through the vertex has been visited (post-order).
 
-    def find_shortest_path(self, start_id, target_id):
+        Yields:
+        string: The vertex ids in the order they are visited.
+        """
+        if not self.contains_id(start_id):
+            raise KeyError("One or both vertices are not in the graph!")
+
+        seen = {start_id}
+        if on_discover is not None:
+            on_discover(start_id, 0, None)
+        yield (start_id, 0, None) if with_details else start_id
+
+        # stack of (vertex id, iterator over its remaining neighbor ids)
+        stack = [(start_id, iter(self.__neighbor_ids(start_id)))]
+        while stack:
+            current_id, neighbors = stack[-1]
+            for neighbor_id in neighbors:
+                if on_edge is not None:
+                    on_edge(current_id, neighbor_id)
+                if neighbor_id not in seen:
+                    seen.add(neighbor_id)
+                    depth = len(stack)
+                    if on_discover is not None:
+                        on_discover(neighbor_id, depth, current_id)
+                    yield (neighbor_id, depth, current_id) if with_details else neighbor_id
+                    stack.append((neighbor_id, iter(self.__neighbor_ids(neighbor_id))))
+                    break
+            else:
+                stack.pop()
+                if on_finish is not None:
+                    on_finish(current_id)
+
+    def __neighbor_ids(self, vertex_id):
+        return self.__vertex_dict[vertex_id].neighbor_ids()
+
+    def __in_neighbor_ids(self, vertex_id):
+        return self.__in_neighbors[vertex_id].keys()
+
+    @cached_query
+    def find_shortest_path(self, start_id, target_id, bidirectional=True):
         """
         Find and return the shortest path from start_id to target_id.
 
         Parameters:
         start_id (string): The id of the start vertex.
         target_id (string): The id of the target (end) vertex.
+        bidirectional (boolean): Search from both endpoints at once. Only
+        used where edges can be followed backwards: on undirected graphs and
+        with `index_in_neighbors`.
 
         Returns:
         list<string>: A list of all vertex ids in the shortest path, from start to end.
@@ -157,38 +782,89 @@ class Graph:
         if not self.contains_id(start_id) or not self.contains_id(target_id):
             raise KeyError("One or both vertices are not in the graph!")
 
-        # vertex keys we've seen before and their paths from the start vertex
-        vertex_id_to_path = {
-            start_id: [start_id] # only one thing in the path
-        }
+        if bidirectional and self.has_in_neighbor_index():
+            return self.__bidirectional_search(start_id, target_id,
+                                               self.__require_in_neighbors())
+
+        # vertex ids we've seen before and the vertex we reached them from
+        parents = {start_id: None}
 
         # queue of vertices to visit next
-        queue = deque() 
-        queue.append(self.get_vertex(start_id))
+        queue = deque()
+        queue.append(start_id)
 
-        # while queue is not empty
-        while queue:
-            current_vertex_obj = queue.pop() # vertex obj to visit next
-            current_vertex_id = current_vertex_obj.get_id()
+        while queue and target_id not in parents:
+            current_id = queue.popleft()
+            for neighbor_id in self.__neighbor_ids(current_id):
+                if neighbor_id not in parents:
+                    parents[neighbor_id] = current_id
+                    queue.append(neighbor_id)
+
+        if target_id not in parents: # path not found
+            return None
+
+        path = [target_id]
+        while parents[path[-1]] is not None:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return path
+
+    def __bidirectional_search(self, start_id, target_id, backward_neighbor_ids):
+        """
+        Breadth-first search from both endpoints, one whole level at a time,
+        always growing the smaller frontier. Only parent pointers are kept;
+        the path is rebuilt once the frontiers meet.
+
+        Parameters:
+        backward_neighbor_ids (function): Maps a vertex id to the ids of the
+        vertices with an edge into it.
+        """
+        if start_id == target_id:
+            return [start_id]
+
+        forward = ({start_id: None}, {start_id: 0}, [start_id], self.__neighbor_ids)
+        backward = ({target_id: None}, {target_id: 0}, [target_id], backward_neighbor_ids)
+        start_side = forward
+
+        while forward[2] and backward[2]:
+            if len(forward[2]) > len(backward[2]):
+                forward, backward = backward, forward
+
+            parents, depth, frontier, neighbor_ids = forward
+            other_depth = backward[1]
+            best_meeting = None
+            best_length = float('inf')
+            next_frontier = []
 
-            # found target, can stop the loop early
-            if current_vertex_id == target_id:
+            for current_id in frontier:
+                next_depth = depth[current_id] + 1
+                for neighbor_id in neighbor_ids(current_id):
+                    if neighbor_id in parents:
+                        continue
+                    parents[neighbor_id] = current_id
+                    depth[neighbor_id] = next_depth
+                    next_frontier.append(neighbor_id)
+                    if neighbor_id in other_depth and next_depth + other_depth[neighbor_id] < best_length:
+                        best_meeting = neighbor_id
+                        best_length = next_depth + other_depth[neighbor_id]
+
+            forward[2][:] = next_frontier
+            if best_meeting is not None:
                 break
+        else:
+            return None # path not found
 
-            neighbors = current_vertex_obj.get_neighbors()
-            for neighbor in neighbors:
-                if neighbor.get_id() not in vertex_id_to_path:
-                    current_path = vertex_id_to_path[current_vertex_id]
-                    # extend the path by 1 vertex
-                    next_path = current_path + [neighbor.get_id()]
-                    vertex_id_to_path[neighbor.get_id()] = next_path
-                    queue.append(neighbor)
-                    # print(vertex_id_to_path)
-
-        if target_id not in vertex_id_to_path: # path not found
-            return None
+        # make `forward` the side that started from start_id again
+        if forward is not start_side:
+            forward, backward = backward, forward
 
-        return vertex_id_to_path[target_id]
+        path = [best_meeting]
+        while forward[0][path[-1]] is not None:
+            path.append(forward[0][path[-1]])
+        path.reverse()
+        while backward[0][path[-1]] is not None:
+            path.append(backward[0][path[-1]])
+        return path
 
     def find_vertices_n_away(self, start_id, target_distance):
         """
@@ -201,75 +877,148 @@ class Graph:
         Returns:
         list<string>: All vertex ids that are `target_distance` away from the start vertex
         """
-        seen = set()
-        dist = { start_id: 0 }
-        queue = deque()
-        queue.append(start_id)
-        current_dist = 0
-        output = []
-        while queue and current_dist < target_distance:
-            current_id = queue.pop()
-            seen.add(current_id)
-            current_dist = dist[current_id]
-            current = self.get_vertex(current_id)
-            for vertex in current.get_neighbors():
-                vertex_id = vertex.get_id()
-                if vertex_id not in seen:
-                    queue.append(vertex_id)
-                
-                if vertex_id not in dist:
-                    dist[vertex_id] = current_dist + 1
-                    if current_dist + 1 == target_distance:
-                        output.append(vertex_id)
-        return output
+        if not self.contains_id(start_id):
+            raise KeyError("Vertex is not in the graph!")
+
+        # expand one whole level at a time, so every vertex in `frontier` is
+        # exactly as far from the start as the number of levels expanded
+        seen = {start_id}
+        frontier = [start_id]
+        for _ in range(target_distance):
+            next_frontier = []
+            for current_id in frontier:
+                for neighbor_id in self.__neighbor_ids(current_id):
+                    if neighbor_id not in seen:
+                        seen.add(neighbor_id)
+                        next_frontier.append(neighbor_id)
+            frontier = next_frontier
+            if not frontier:
+                break
+        return frontier
+
+    def batch_shortest_paths(self, pairs, workers=1):
+        """
+        Find the shortest path for many (start_id, target_id) pairs at once.
+        Pairs that share a start vertex are answered from one BFS tree, and the
+        work can be spread over several processes that share a frozen copy of
+        the graph.
+
+        Parameters:
+        pairs (iterable<(string, string)>): The (start_id, target_id) queries.
+        workers (integer): The number of worker processes to use.
+
+        Returns:
+        iterator<list<string>>: The path for each pair, in input order. A path
+        is None if the target cannot be reached.
+        """
+        return batch_queries.run_batch(self.freeze(), batch_queries._shortest_paths_from,
+                                       pairs, workers)
+
+    def batch_vertices_n_away(self, queries, workers=1):
+        """
+        Find all vertices n distance away for many (start_id, target_distance)
+        queries at once. Queries that share a start vertex are answered from
+        one BFS.
+
+        Parameters:
+        queries (iterable<(string, integer)>): The (start_id, target_distance) queries.
+        workers (integer): The number of worker processes to use.
+
+        Returns:
+        iterator<list<string>>: The vertex ids for each query, in input order.
+        """
+        return batch_queries.run_batch(self.freeze(), batch_queries._vertices_n_away_from,
+                                       queries, workers)
+
+    @cached_query
+    def bipartition(self):
+        """
+        Split the vertices into two sides with no edge inside either side, in
+        O(V + E). Edge direction is ignored and every component is checked.
+
+        Returns:
+        ((list<string>, list<string>), None): The two sides, if the graph is
+        bipartite. Otherwise (None, list<string>): the vertex ids around an
+        odd cycle, which proves it is not.
+        """
+        return self.freeze().bipartition()
 
     def is_bipartite(self):
         """
         Return True if the graph is bipartite, and False otherwise.
         """
-        start_id = list(self.__vertex_dict.keys())[0]
-        queue = [start_id]
-        color_dict = {start_id: 0}
-        seen = set()
-        seen.add(start_id)
-        color = 0
-        while len(queue) > 0:
-            current_id = queue.pop(0)
-            color = color_dict[current_id]
-            seen.add(current_id)
-            current_node = self.get_vertex(current_id)
-            for neighbor in current_node.get_neighbors():
-                neighbor_id = neighbor.get_id()
-                if neighbor_id in color_dict:
-                    if color_dict[neighbor_id] == color:
-                        return False
-                else:
-                    color_dict[neighbor_id] = (color + 1) % 2
-                    queue.append(neighbor_id)
-        return True
+        return self.bipartition()[1] is None
+
+    def __require_components(self):
+        if self.__components is None:
+            raise ValueError("Component tracking is off; create the graph with track_components=True")
+        return self.__components
+
+    def component_of(self, vertex_id):
+        """
+        Return a label for the connected component of `vertex_id`. Two vertices
+        are connected exactly when their labels are equal.
+        Requires `track_components`.
+        """
+        return self.__require_components().find(vertex_id)
+
+    def same_component(self, vertex_id1, vertex_id2):
+        """
+        Return True if there is a path between the two vertices.
+        Requires `track_components`.
+        """
+        return self.__require_components().connected(vertex_id1, vertex_id2)
+
+    def component_count(self):
+        """
+        Return the number of connected components.
+        Requires `track_components`.
+        """
+        return self.__require_components().count()
+
+    def __require_reachability(self):
+        if self.__reachability is None:
+            raise ValueError("Reachability tracking is off; create the graph with track_reachability=True")
+        return self.__reachability
+
+    def reachable(self, vertex_id1, vertex_id2):
+        """
+        Return True if there is a path from `vertex_id1` to `vertex_id2`, in
+        O(1). Requires `track_reachability`.
+        """
+        if not self.contains_id(vertex_id1) or not self.contains_id(vertex_id2):
+            raise KeyError("One or both vertices are not in the graph!")
+        return self.__require_reachability().reachable(vertex_id1, vertex_id2)
+
+    def get_reachability_index(self):
+        """
+        Return the ReachabilityIndex, e.g. for its memory usage.
+        Requires `track_reachability`.
+        """
+        return self.__require_reachability()
 
+    @cached_query
     def find_connected_components(self):
         """
         Return a list of all connected components, with each connected component
         represented as a list of vertex ids.
         """
+        if self.__components is not None:
+            return self.__components.groups()
+
         vertices = set(self.__vertex_dict.keys())
 
         components = []
 
         while len(vertices) > 0:
-            start_id = list(vertices).pop()
-            vertices.remove(start_id)
-            start_vertex = self.get_vertex(start_id)
+            start_id = vertices.pop()
             seen = set()
             queue = deque()
             queue.append(start_id)
             seen.add(start_id)
             while len(queue) > 0:
                 current_id = queue.pop()
-                current_vertex = self.get_vertex(current_id)
-                for neighbor in current_vertex.get_neighbors():
-                    neighbor_id = neighbor.get_id()
+                for neighbor_id in self.__vertex_dict[current_id].neighbor_ids():
                     if neighbor_id in vertices:
                         vertices.remove(neighbor_id)
                     if neighbor_id not in seen:
@@ -278,42 +1027,75 @@ class Graph:
             components.append(list(seen))
         return(components)
 
+    @cached_query
+    def strongly_connected_components(self):
+        """
+        Return a list of all strongly connected components, with each one
+        represented as a list of vertex ids. A component comes before every
+        component that has an edge into it.
+        """
+        return strongly_connected_components(self.__vertex_dict, self.__neighbor_ids)
+
     def contains_cycle(self):
         """
-        Return True if the directed graph contains a cycle, False otherwise.
+        Return True if the graph contains a cycle, False otherwise.
         """
-        seen = set()
-        current_path = []
-        def dfs_traversal_recursive(vertex):
-            for neighbor in vertex.get_neighbors():
-                if neighbor.get_id() not in seen:
-                    seen.add(neighbor.get_id())
-                    dfs_traversal_recursive(neighbor)
-            return
+        for vertex_id, vertex in self.__vertex_dict.items():
+            if vertex.has_neighbor(vertex_id): # self-loop
+                return True
 
-        seen.add(start_id)
-        for vertex in self.get_vertices():
-            dfs_traversal_recursive(vertex)
-        
+        if not self.__is_directed:
+            # a forest has exactly V - C edges; each edge is stored twice
+            num_edges = sum(vertex.degree() for vertex in self.__vertex_dict.values()) // 2
+            return num_edges > len(self.__vertex_dict) - len(self.find_connected_components())
 
-    
+        return any(len(component) > 1 for component in self.strongly_connected_components())
+
+    def condensation(self):
+        """
+        Collapse every strongly connected component into a single vertex.
+
+        Returns:
+        (list<list<string>>, Graph): The components, in topological order, and
+        a directed acyclic Graph whose vertex `i` stands for `components[i]`.
+        """
+        components = self.strongly_connected_components()[::-1]
+        component_of = {}
+        for i, component in enumerate(components):
+            for vertex_id in component:
+                component_of[vertex_id] = i
+
+        dag = Graph(is_directed=True)
+        for i in range(len(components)):
+            dag.add_vertex(i)
+        dag.add_edges(
+            (i, component_of[neighbor_id])
+            for i, component in enumerate(components)
+            for vertex_id in component
+            for neighbor_id in self.__neighbor_ids(vertex_id)
+            if component_of[neighbor_id] != i
+        )
+        return components, dag
+
+    @cached_query
     def topological_sort(self):
         """
         Return a valid ordering of vertices in a directed acyclic graph.
         If the graph contains a cycle, throw a ValueError.
+
+        With `track_topological_order` the maintained order is read in O(V).
         """
-        vertices = self.get_vertices()
-        indegree_dict = {}
-        for vertex in vertices:
-            if vertex.get_id() not in indegree_dict:
-                indegree_dict[vertex.get_id()] = 0
-            for neighbor in vertex.get_neighbors():
-                neighbor_id = neighbor.get_id()
-                if neighbor_id in indegree_dict:
-                    indegree_dict[neighbor_id] += 1
-                else:
-                    indegree_dict[neighbor_id] = 1
-        
+        if self.__topological_order is not None:
+            return self.__topological_order.order()
+        return self.__kahn_order()
+
+    def __kahn_order(self):
+        if self.__in_neighbors is not None:
+            indegree_dict = {vertex_id: len(in_neighbors)
+                             for vertex_id, in_neighbors in self.__in_neighbors.items()}
+        else:
+            indegree_dict = self.__count_indegrees()
+
         indeg0 = []
         for vertex_id, indegree in indegree_dict.items():
             if indegree == 0:
@@ -324,10 +1106,24 @@ class Graph:
         while len(indeg0) > 0:
             current_id = indeg0.pop()
             sorted_list.append(current_id)
-            current_vertex = self.get_vertex(current_id)
-            for neighbor in current_vertex.get_neighbors():
-                neighbor_id = neighbor.get_id()
+            for neighbor_id in self.__vertex_dict[current_id].neighbor_ids():
                 indegree_dict[neighbor_id] -= 1
                 if indegree_dict[neighbor_id] == 0:
                     indeg0.append(neighbor_id)
-        return sorted_list
\ No newline at end of file
+
+        if len(sorted_list) != len(self.__vertex_dict):
+            raise ValueError("The graph contains a cycle!")
+        return sorted_list
+
+    def __count_indegrees(self):
+        """Return a dict of vertex id -> indegree, by scanning every edge."""
+        indegree_dict = {}
+        for vertex_id, vertex in self.__vertex_dict.items():
+            if vertex_id not in indegree_dict:
+                indegree_dict[vertex_id] = 0
+            for neighbor_id in vertex.neighbor_ids():
+                if neighbor_id in indegree_dict:
+                    indegree_dict[neighbor_id] += 1
+                else:
+                    indegree_dict[neighbor_id] = 1
+        return indegree_dict
@@ -0,0 +1,44 @@
+import math
+
+# Heuristics for WeightedGraph.astar. Each one is called as
+# heuristic(vertex_id, target_id) and must never overestimate the remaining
+# distance, or A* may return a path that is not the shortest.
+
+
+def zero_heuristic(vertex_id, target_id):
+    """Always estimate 0, which makes A* behave exactly like Dijkstra's Algorithm."""
+    return 0
+
+
+def euclidean_heuristic(coordinates, scale=1):
+    """
+    Return a heuristic giving the straight-line distance between two vertices.
+
+    Parameters:
+    coordinates (dict): Vertex id -> (x, y) position, or any tuple of numbers.
+    scale (number): Multiplies the distance, e.g. the smallest weight per unit
+    of distance, so the estimate stays a lower bound.
+    """
+    def heuristic(vertex_id, target_id):
+        return scale * math.dist(coordinates[vertex_id], coordinates[target_id])
+    return heuristic
+
+
+def manhattan_heuristic(coordinates, scale=1):
+    """
+    Return a heuristic giving the grid (L1) distance between two vertices.
+    Only a lower bound when moves are along the axes, as on a grid.
+
+    Parameters:
+    coordinates (dict): Vertex id -> (x, y) position, or any tuple of numbers.
+    scale (number): Multiplies the distance.
+    """
+    def heuristic(vertex_id, target_id):
+        return scale * sum(abs(a - b) for a, b in zip(coordinates[vertex_id], coordinates[target_id]))
+    return heuristic
+
+
+HEURISTICS = {
+    'euclidean': euclidean_heuristic,
+    'manhattan': manhattan_heuristic,
+}
@@ -0,0 +1,104 @@
+class IndexedMinHeap(object):
+    """ IndexedMinHeap Class
+    A binary min-heap of items keyed by priority that remembers where each
+    item lives, so an item's priority can be lowered in O(log n).
+    """
+    def __init__(self):
+        """Initialize an empty heap."""
+        self.__items = [] # heap-ordered list of items
+        self.__priorities = [] # priority of the item at the same position
+        self.__position = {} # item -> index in the heap lists
+
+    def __len__(self):
+        """Return the number of items in the heap."""
+        return len(self.__items)
+
+    def __contains__(self, item):
+        return item in self.__position
+
+    def priority(self, item):
+        """Return the current priority of `item`."""
+        return self.__priorities[self.__position[item]]
+
+    def push(self, item, priority):
+        """
+        Add `item` with the given priority. If it is already in the heap, its
+        priority is lowered to `priority` when that is smaller.
+
+        Returns:
+        boolean: True if the item was added or its priority was lowered.
+        """
+        if item in self.__position:
+            return self.decrease_key(item, priority)
+
+        self.__position[item] = len(self.__items)
+        self.__items.append(item)
+        self.__priorities.append(priority)
+        self.__sift_up(len(self.__items) - 1)
+        return True
+
+    def decrease_key(self, item, priority):
+        """
+        Lower the priority of `item`, which must be in the heap.
+
+        Returns:
+        boolean: True if the priority was lowered.
+        """
+        index = self.__position[item]
+        if priority >= self.__priorities[index]:
+            return False
+        self.__priorities[index] = priority
+        self.__sift_up(index)
+        return True
+
+    def peek(self):
+        """Return (item, priority) with the smallest priority without removing it."""
+        if not self.__items:
+            raise IndexError("peek from an empty heap")
+        return self.__items[0], self.__priorities[0]
+
+    def pop(self):
+        """Remove and return (item, priority) with the smallest priority."""
+        if not self.__items:
+            raise IndexError("pop from an empty heap")
+
+        items, priorities = self.__items, self.__priorities
+        item, priority = items[0], priorities[0]
+        last_item, last_priority = items.pop(), priorities.pop()
+        del self.__position[item]
+        if items:
+            items[0], priorities[0] = last_item, last_priority
+            self.__position[last_item] = 0
+            self.__sift_down(0)
+        return item, priority
+
+    def __sift_up(self, index):
+        items, priorities, position = self.__items, self.__priorities, self.__position
+        item, priority = items[index], priorities[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if priorities[parent] <= priority:
+                break
+            items[index], priorities[index] = items[parent], priorities[parent]
+            position[items[index]] = index
+            index = parent
+        items[index], priorities[index] = item, priority
+        position[item] = index
+
+    def __sift_down(self, index):
+        items, priorities, position = self.__items, self.__priorities, self.__position
+        size = len(items)
+        item, priority = items[index], priorities[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and priorities[child + 1] < priorities[child]:
+                child += 1
+            if priorities[child] >= priority:
+                break
+            items[index], priorities[index] = items[child], priorities[child]
+            position[items[index]] = index
+            index = child
+        items[index], priorities[index] = item, priority
+        position[item] = index
@@ -0,0 +1,305 @@
+import heapq
+import random
+import struct
+import sys
+import zlib
+from array import array
+
+from graphs.csr_graph import CSRGraph
+
+INFINITY = float('inf')
+
+# File layout (little-endian): header, then the landmark indices as int32,
+# then the forward table and, for directed graphs, the backward table, each
+# as K * n float64 values.
+MAGIC = b'ALTL'
+VERSION = 1
+HEADER = struct.Struct('<4sIIIQI')
+
+
+def _dijkstra(offsets, targets, weights, source, num_vertices):
+    """Return the distance from `source` to every vertex, as an array."""
+    distances = array('d', [INFINITY]) * num_vertices
+    distances[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        distance, current = heapq.heappop(heap)
+        if distance > distances[current]:
+            continue # stale entry
+        for position in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[position]
+            new_distance = distance + weights[position]
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                heapq.heappush(heap, (new_distance, neighbor))
+    return distances
+
+
+def _reverse(offsets, targets, weights, num_vertices):
+    """Return the (offsets, targets, weights) arrays of the graph with every edge flipped."""
+    counts = array('q', [0]) * (num_vertices + 1)
+    for target in targets:
+        counts[target + 1] += 1
+    for i in range(num_vertices):
+        counts[i + 1] += counts[i]
+
+    next_slot = array('q', counts)
+    reverse_targets = array('i', [0]) * len(targets)
+    reverse_weights = array('d', [0.0]) * len(targets)
+    for source in range(num_vertices):
+        for position in range(offsets[source], offsets[source + 1]):
+            target = targets[position]
+            slot = next_slot[target]
+            reverse_targets[slot] = source
+            reverse_weights[slot] = weights[position]
+            next_slot[target] = slot + 1
+    return counts, reverse_targets, reverse_weights
+
+
+def _fingerprint(graph):
+    """Return a checksum of the graph's structure, to tell graph versions apart."""
+    vertex_ids, offsets, targets = graph.arrays()
+    checksum = zlib.crc32('\n'.join(map(str, vertex_ids)).encode())
+    for data in (offsets, targets, graph.edge_weights()):
+        checksum = zlib.crc32(memoryview(data).cast('B'), checksum)
+    return checksum
+
+
+class LandmarkOracle(object):
+    """ LandmarkOracle Class
+    Answers repeated point-to-point distance queries on a static weighted
+    graph with the ALT method (A*, Landmarks, Triangle inequality).
+
+    The exact distances from (and, if directed, to) K landmark vertices are
+    computed once. For any u, v and landmark L, the triangle inequality gives
+    d(u, v) >= d(L, v) - d(L, u) and d(u, v) >= d(u, L) - d(v, L), which is a
+    cheap lower bound and an A* heuristic that points straight at the target.
+    """
+    def __init__(self, graph, num_landmarks=8, strategy='farthest', seed=0):
+        """
+        Pick the landmarks and compute their distance tables.
+
+        Parameters:
+        graph (WeightedGraph or CSRGraph): The graph to answer queries on. A
+        CSRGraph must have weights. Weights must not be negative.
+        num_landmarks (integer): How many landmarks to use.
+        strategy (string): 'farthest' picks each landmark as far as possible
+        from the ones already chosen; 'random' picks them uniformly.
+        seed (integer): Seeds the random choices.
+        """
+        self.__set_graph(graph)
+        num_vertices = self.__graph.num_vertices()
+        num_landmarks = min(num_landmarks, num_vertices)
+        if strategy not in ('farthest', 'random'):
+            raise ValueError(f"Unknown landmark strategy {strategy!r}")
+
+        rng = random.Random(seed)
+        self.__landmarks = array('i')
+        self.__forward = array('d')
+        self.__backward = array('d') if self.__graph.is_directed() else self.__forward
+
+        if strategy == 'random':
+            chosen = rng.sample(range(num_vertices), num_landmarks)
+        else:
+            chosen = [rng.randrange(num_vertices)] if num_vertices else []
+        closest = array('d', [INFINITY]) * num_vertices
+
+        while len(self.__landmarks) < num_landmarks:
+            landmark = chosen[len(self.__landmarks)]
+            self.__add_landmark(landmark)
+            if strategy == 'farthest' and len(chosen) < num_landmarks:
+                forward = self.__table(self.__forward, len(self.__landmarks) - 1)
+                for i in range(num_vertices):
+                    if forward[i] < closest[i]:
+                        closest[i] = forward[i]
+                for landmark_index in self.__landmarks:
+                    closest[landmark_index] = -1.0
+                # vertices no landmark reaches come first, then the farthest one
+                chosen.append(max(range(num_vertices), key=closest.__getitem__))
+
+    def __set_graph(self, graph):
+        if not isinstance(graph, CSRGraph):
+            graph = graph.freeze()
+        if not graph.is_weighted():
+            raise ValueError("The graph is not weighted!")
+        self.__graph = graph
+
+        _, offsets, targets = graph.arrays()
+        weights = graph.edge_weights()
+        self.__arrays = (offsets, targets, weights)
+        if graph.is_directed():
+            self.__reverse_arrays = _reverse(offsets, targets, weights, graph.num_vertices())
+        else:
+            self.__reverse_arrays = self.__arrays
+
+    def __add_landmark(self, landmark):
+        num_vertices = self.__graph.num_vertices()
+        self.__landmarks.append(landmark)
+        self.__forward.extend(_dijkstra(*self.__arrays, landmark, num_vertices))
+        if self.__graph.is_directed():
+            self.__backward.extend(_dijkstra(*self.__reverse_arrays, landmark, num_vertices))
+
+    def __table(self, tables, k):
+        num_vertices = self.__graph.num_vertices()
+        return tables[k * num_vertices:(k + 1) * num_vertices]
+
+    def get_landmarks(self):
+        """Return the ids of the landmark vertices."""
+        return [self.__graph.id_of(i) for i in self.__landmarks]
+
+    def memory_usage(self):
+        """Return the number of bytes used by the distance tables."""
+        size = sys.getsizeof(self.__forward) + sys.getsizeof(self.__landmarks)
+        if self.__backward is not self.__forward:
+            size += sys.getsizeof(self.__backward)
+        return size
+
+    def __bound_indices(self, u, v):
+        """Return the best triangle-inequality lower bound on d(u, v), by index."""
+        num_vertices = self.__graph.num_vertices()
+        forward, backward = self.__forward, self.__backward
+        best = 0.0
+        for k in range(len(self.__landmarks)):
+            base = k * num_vertices
+            from_landmark_u, from_landmark_v = forward[base + u], forward[base + v]
+            if from_landmark_u < INFINITY:
+                if from_landmark_v == INFINITY:
+                    return INFINITY # L reaches u but not v, so u cannot reach v
+                best = max(best, from_landmark_v - from_landmark_u)
+            to_landmark_u, to_landmark_v = backward[base + u], backward[base + v]
+            if to_landmark_v < INFINITY:
+                if to_landmark_u == INFINITY:
+                    return INFINITY # v reaches L but u does not, so u cannot reach v
+                best = max(best, to_landmark_u - to_landmark_v)
+        return best
+
+    def lower_bound(self, start_id, target_id):
+        """Return a lower bound on the distance from start_id to target_id, in O(K)."""
+        graph = self.__graph
+        return self.__bound_indices(graph.index_of(start_id), graph.index_of(target_id))
+
+    def upper_bound(self, start_id, target_id):
+        """
+        Return an upper bound on the distance from start_id to target_id, in
+        O(K): the shortest detour through a landmark.
+        """
+        graph = self.__graph
+        u, v = graph.index_of(start_id), graph.index_of(target_id)
+        if u == v:
+            return 0.0
+        num_vertices = graph.num_vertices()
+        forward, backward = self.__forward, self.__backward
+        return min((backward[k * num_vertices + u] + forward[k * num_vertices + v]
+                    for k in range(len(self.__landmarks))), default=INFINITY)
+
+    def shortest_path(self, start_id, target_id):
+        """
+        Find the exact shortest path with A*, using the landmark bounds as the
+        heuristic.
+
+        Returns:
+        (float, list<string>): The total weight and the vertex ids on the path,
+        or (None, None) if the target is unreachable.
+        """
+        graph = self.__graph
+        if not graph.contains_id(start_id) or not graph.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        start, target = graph.index_of(start_id), graph.index_of(target_id)
+        if self.__bound_indices(start, target) == INFINITY:
+            return None, None
+
+        offsets, targets, weights = self.__arrays
+        best = {start: 0.0}
+        predecessors = {start: None}
+        heap = [(self.__bound_indices(start, target), 0.0, start)]
+        while heap:
+            _, distance, current = heapq.heappop(heap)
+            if distance > best[current]:
+                continue # stale entry
+            if current == target:
+                path = [target]
+                while predecessors[path[-1]] is not None:
+                    path.append(predecessors[path[-1]])
+                return distance, [graph.id_of(i) for i in reversed(path)]
+
+            for position in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[position]
+                new_distance = distance + weights[position]
+                if new_distance < best.get(neighbor, INFINITY):
+                    best[neighbor] = new_distance
+                    predecessors[neighbor] = current
+                    estimate = new_distance + self.__bound_indices(neighbor, target)
+                    heapq.heappush(heap, (estimate, new_distance, neighbor))
+        return None, None
+
+    def distance(self, start_id, target_id):
+        """Return the exact distance from start_id to target_id, or None if unreachable."""
+        return self.shortest_path(start_id, target_id)[0]
+
+    def save(self, filename):
+        """
+        Write the landmarks and distance tables to `filename`, tagged with a
+        checksum of the graph so they are only loaded for the same graph.
+        """
+        def little_endian(data):
+            data = array(data.typecode, data)
+            if sys.byteorder != 'little':
+                data.byteswap()
+            return data.tobytes()
+
+        with open(filename, 'wb') as my_file:
+            my_file.write(HEADER.pack(MAGIC, VERSION, len(self.__landmarks),
+                                      int(self.__graph.is_directed()),
+                                      self.__graph.num_vertices(), _fingerprint(self.__graph)))
+            my_file.write(little_endian(self.__landmarks))
+            my_file.write(little_endian(self.__forward))
+            if self.__graph.is_directed():
+                my_file.write(little_endian(self.__backward))
+
+    @classmethod
+    def load(cls, filename, graph):
+        """
+        Load tables written by `save`.
+
+        Parameters:
+        filename (string): The path of the file to read.
+        graph (WeightedGraph or CSRGraph): The graph the tables were built for.
+
+        Returns:
+        LandmarkOracle: The oracle, ready for queries.
+        """
+        oracle = cls.__new__(cls)
+        oracle.__set_graph(graph)
+        graph = oracle.__graph
+
+        with open(filename, 'rb') as my_file:
+            data = my_file.read()
+        if len(data) < HEADER.size:
+            raise ValueError("Not a landmark file")
+        magic, version, num_landmarks, is_directed, num_vertices, fingerprint = \
+            HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a landmark file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported landmark file version {version}")
+        if (bool(is_directed) != graph.is_directed() or num_vertices != graph.num_vertices()
+                or fingerprint != _fingerprint(graph)):
+            raise ValueError("The landmark file was built for a different graph")
+        num_tables = 2 if is_directed else 1
+        if len(data) != HEADER.size + 4 * num_landmarks + 8 * num_landmarks * num_vertices * num_tables:
+            raise ValueError("Corrupt landmark file")
+
+        def take(typecode, count, position):
+            values = array(typecode)
+            values.frombytes(data[position:position + values.itemsize * count])
+            if sys.byteorder != 'little':
+                values.byteswap()
+            return values, position + values.itemsize * count
+
+        oracle.__landmarks, position = take('i', num_landmarks, HEADER.size)
+        oracle.__forward, position = take('d', num_landmarks * num_vertices, position)
+        if graph.is_directed():
+            oracle.__backward, position = take('d', num_landmarks * num_vertices, position)
+        else:
+            oracle.__backward = oracle.__forward
+        return oracle
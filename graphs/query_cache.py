@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from functools import wraps
+
+
+class QueryCache(object):
+    """ QueryCache Class
+    A bounded least-recently-used cache of query results.
+    """
+    def __init__(self, maxsize=128):
+        """
+        Initialize an empty cache.
+
+        Parameters:
+        maxsize (integer): The most results to keep before evicting the least
+        recently used one.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.__maxsize = maxsize
+        self.__entries = OrderedDict() # key -> result, oldest first
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        """Return the number of cached results."""
+        return len(self.__entries)
+
+    def get(self, key, default=None):
+        """Return the result cached under `key`, or `default` if there is none."""
+        try:
+            result = self.__entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.__entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        """Cache `result` under `key`, evicting the oldest result if full."""
+        self.__entries[key] = result
+        self.__entries.move_to_end(key)
+        if len(self.__entries) > self.__maxsize:
+            self.__entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every cached result. The counters are kept."""
+        self.__entries.clear()
+
+    def stats(self):
+        """
+        Return the cache counters.
+
+        Returns:
+        dict: hits, misses, evictions, the current size and the maximum size.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.__entries),
+            'maxsize': self.__maxsize,
+        }
+
+
+_MISSING = object()
+
+
+def cached_query(method):
+    """
+    Memoize a read-only graph method in the graph's query cache.
+
+    Results are keyed by (method name, arguments, graph version), so a result
+    is never served after the graph has been changed. Every caller gets its
+    own copy of the lists, dicts and sets in a result, so changing one cannot
+    change what later callers see.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.get_query_cache()
+        if cache is None:
+            return method(self, *args, **kwargs)
+
+        key = (name, args, tuple(sorted(kwargs.items())), self.get_version())
+        result = cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = method(self, *args, **kwargs)
+            cache.put(key, result)
+        return _copy_result(result)
+
+    return wrapper
+
+
+def _copy_result(result):
+    """
+    Copy the containers in a query result. Anything else, e.g. the ids or a
+    frozen CSRGraph, is immutable and shared.
+    """
+    if isinstance(result, list):
+        return [_copy_result(item) for item in result]
+    if isinstance(result, tuple):
+        return tuple(_copy_result(item) for item in result)
+    if isinstance(result, dict):
+        return {key: _copy_result(value) for key, value in result.items()}
+    if isinstance(result, set):
+        return set(result)
+    return result
@@ -0,0 +1,148 @@
+import sys
+
+from graphs.scc import strongly_connected_components
+
+
+class ReachabilityIndex(object):
+    """ ReachabilityIndex Class
+    Answers "is there a path from a to b?" in O(1), from the transitive
+    closure of a directed graph stored as one bitset per strongly connected
+    component.
+
+    Every vertex in a component reaches the same vertices, so the closure is
+    built on the condensation: in reverse topological order, each component's
+    bitset is its own bit OR-ed with the bitsets of the components it has an
+    edge into. The ORs are done on Python integers, so they run in C one
+    machine word at a time. Each result is stored as a little-endian
+    bytearray, so a query reads a single byte. Memory is about C * C / 8
+    bytes for C components.
+    """
+    def __init__(self, vertex_ids, neighbor_ids):
+        """
+        Build the index.
+
+        Parameters:
+        vertex_ids (iterable): The ids of every vertex in the graph. It is
+        iterated again whenever the index is rebuilt, so pass a live view.
+        neighbor_ids (function): Maps a vertex id to the ids of its out-neighbors.
+        """
+        self.__vertex_ids = vertex_ids
+        self.__neighbor_ids = neighbor_ids
+        self.rebuild()
+
+    def rebuild(self):
+        """Recompute the whole index from the graph."""
+        neighbor_ids = self.__neighbor_ids
+        components = strongly_connected_components(self.__vertex_ids, neighbor_ids)
+        component_of = {} # vertex id -> component number
+        reach = [] # component number -> bitset of the component numbers it reaches
+
+        # components come sinks first, so everything they point at is done
+        for i, component in enumerate(components):
+            for vertex_id in component:
+                component_of[vertex_id] = i
+            bits = 1 << i
+            for vertex_id in component:
+                for neighbor_id in neighbor_ids(vertex_id):
+                    j = component_of[neighbor_id]
+                    if j != i:
+                        bits |= int.from_bytes(reach[j], 'little')
+            reach.append(_to_row(bits))
+
+        self.__components = components
+        self.__component_of = component_of
+        self.__reach = reach
+        self.__stale = False
+
+    def __refresh(self):
+        if self.__stale:
+            self.rebuild()
+
+    def add_vertex(self, vertex_id):
+        """Update the index for a new vertex with no edges."""
+        if self.__stale:
+            return
+        if vertex_id in self.__component_of:
+            self.__stale = True # the vertex was replaced and lost its edges
+            return
+        self.__component_of[vertex_id] = len(self.__reach)
+        self.__components.append([vertex_id])
+        self.__reach.append(_to_row(1 << len(self.__reach)))
+
+    def add_edge(self, vertex_id1, vertex_id2):
+        """
+        Update the index for a new edge from `vertex_id1` to `vertex_id2`.
+
+        An edge that keeps the condensation acyclic costs one O(1) test per
+        component, plus an O(C / 8) OR for each component that reaches
+        `vertex_id1`: those now also reach whatever `vertex_id2` reaches. An
+        edge that closes a cycle merges components, so the index is rebuilt
+        on the next query instead.
+        """
+        if self.__stale:
+            return
+        reach = self.__reach
+        source = self.__component_of[vertex_id1]
+        target = self.__component_of[vertex_id2]
+        if _has_bit(reach[source], target):
+            return # already reachable
+        if _has_bit(reach[target], source):
+            self.__stale = True
+            return
+
+        added = int.from_bytes(reach[target], 'little')
+        for i, row in enumerate(reach):
+            if _has_bit(row, source):
+                reach[i] = _to_row(int.from_bytes(row, 'little') | added)
+
+    def reachable(self, vertex_id1, vertex_id2):
+        """Return True if there is a path from `vertex_id1` to `vertex_id2`, in O(1)."""
+        self.__refresh()
+        component_of = self.__component_of
+        return _has_bit(self.__reach[component_of[vertex_id1]], component_of[vertex_id2])
+
+    def descendants(self, vertex_id):
+        """Return the ids of every vertex reachable from `vertex_id`, including itself."""
+        self.__refresh()
+        components = self.__components
+        bits = int.from_bytes(self.__reach[self.__component_of[vertex_id]], 'little')
+        result = []
+        while bits:
+            lowest = bits & -bits
+            result.extend(components[lowest.bit_length() - 1])
+            bits ^= lowest
+        return result
+
+    def num_components(self):
+        """Return the number of strongly connected components."""
+        self.__refresh()
+        return len(self.__reach)
+
+    def memory_usage(self):
+        """
+        Return the number of bytes used by the index.
+
+        Returns:
+        dict: The bytes used by the bitsets, by the vertex -> component table,
+        and their total.
+        """
+        self.__refresh()
+        bitset_bytes = sys.getsizeof(self.__reach) + sum(map(sys.getsizeof, self.__reach))
+        table_bytes = sys.getsizeof(self.__component_of) + sys.getsizeof(self.__components) + \
+            sum(map(sys.getsizeof, self.__components))
+        return {
+            'components': len(self.__reach),
+            'bitset_bytes': bitset_bytes,
+            'table_bytes': table_bytes,
+            'total_bytes': bitset_bytes + table_bytes,
+        }
+
+
+def _to_row(bits):
+    """Return the bitset `bits` as a little-endian bytearray."""
+    return bytearray(bits.to_bytes((bits.bit_length() + 7) // 8, 'little'))
+
+
+def _has_bit(row, i):
+    """Return True if bit `i` is set in the bytearray `row`."""
+    return i >> 3 < len(row) and row[i >> 3] >> (i & 7) & 1 == 1
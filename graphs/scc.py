@@ -0,0 +1,62 @@
+def strongly_connected_components(vertex_ids, neighbor_ids):
+    """
+    Find the strongly connected components of a directed graph with Tarjan's
+    algorithm, in O(V + E).
+
+    The depth-first search keeps its own stack of (vertex, neighbor iterator)
+    frames instead of recursing, so paths millions of vertices deep are fine.
+
+    Parameters:
+    vertex_ids (iterable): The ids of every vertex in the graph.
+    neighbor_ids (function): Maps a vertex id to the ids of its out-neighbors.
+
+    Returns:
+    list<list>: The vertex ids of each component. A component is listed
+    before every component that has an edge into it (reverse topological
+    order of the condensation).
+    """
+    index = {} # vertex id -> discovery order
+    lowlink = {} # vertex id -> lowest discovery order reachable from it
+    on_stack = set()
+    stack = []
+    components = []
+
+    for root_id in vertex_ids:
+        if root_id in index:
+            continue
+
+        index[root_id] = lowlink[root_id] = len(index)
+        stack.append(root_id)
+        on_stack.add(root_id)
+        work = [(root_id, iter(neighbor_ids(root_id)))]
+
+        while work:
+            current_id, neighbors = work[-1]
+            for neighbor_id in neighbors:
+                if neighbor_id not in index:
+                    index[neighbor_id] = lowlink[neighbor_id] = len(index)
+                    stack.append(neighbor_id)
+                    on_stack.add(neighbor_id)
+                    work.append((neighbor_id, iter(neighbor_ids(neighbor_id))))
+                    break
+                if neighbor_id in on_stack and index[neighbor_id] < lowlink[current_id]:
+                    lowlink[current_id] = index[neighbor_id]
+            else:
+                # every neighbor is done, so current_id is finished
+                work.pop()
+                if work:
+                    parent_id = work[-1][0]
+                    if lowlink[current_id] < lowlink[parent_id]:
+                        lowlink[parent_id] = lowlink[current_id]
+
+                if lowlink[current_id] == index[current_id]:
+                    component = []
+                    while True:
+                        member_id = stack.pop()
+                        on_stack.discard(member_id)
+                        component.append(member_id)
+                        if member_id == current_id:
+                            break
+                    components.append(component)
+
+    return components
@@ -0,0 +1,98 @@
+class TopologicalOrder(object):
+    """ TopologicalOrder Class
+    Keeps a topological order of a directed acyclic graph up to date while
+    edges are inserted, with the Pearce-Kelly algorithm.
+
+    Inserting an edge x -> y with x already before y costs O(1). Otherwise
+    only the vertices placed between y and x can be out of order: a forward
+    search from y and a backward search from x, both bounded to that region,
+    find them, and they are shuffled within the positions they already hold.
+    """
+    def __init__(self, successors, predecessors, order=()):
+        """
+        Parameters:
+        successors (function): Maps a vertex id to the ids of its out-neighbors.
+        predecessors (function): Maps a vertex id to the ids of its in-neighbors.
+        order (iterable): The vertex ids of the graph in a valid topological order.
+        """
+        self.__successors = successors
+        self.__predecessors = predecessors
+        self.__order = [] # position -> vertex id
+        self.__position = {} # vertex id -> position
+        for vertex_id in order:
+            self.add_vertex(vertex_id)
+
+    def __len__(self):
+        """Return the number of vertices."""
+        return len(self.__order)
+
+    def __contains__(self, vertex_id):
+        return vertex_id in self.__position
+
+    def add_vertex(self, vertex_id):
+        """Place a new vertex, which has no edges yet, at the end of the order."""
+        if vertex_id not in self.__position:
+            self.__position[vertex_id] = len(self.__order)
+            self.__order.append(vertex_id)
+
+    def position(self, vertex_id):
+        """Return the position of `vertex_id` in the order."""
+        return self.__position[vertex_id]
+
+    def order(self):
+        """Return the vertex ids in topological order, as a new list."""
+        return list(self.__order)
+
+    def add_edge(self, vertex_id1, vertex_id2):
+        """
+        Reorder the vertices for a new edge from `vertex_id1` to `vertex_id2`.
+        Call this before the edge is stored in the graph.
+
+        Raises:
+        ValueError: If the edge would close a cycle. The order is unchanged.
+        """
+        position = self.__position
+        lower = position[vertex_id2]
+        upper = position[vertex_id1]
+        if vertex_id1 == vertex_id2:
+            raise ValueError(f"Adding edge {vertex_id1!r} -> {vertex_id2!r} would create a cycle!")
+        if upper < lower:
+            return # already in order
+
+        # everything reachable from vertex_id2 that is placed before vertex_id1
+        forward = self.__search(vertex_id2, self.__successors,
+                                lambda p: p <= upper, vertex_id1)
+        if forward is None:
+            raise ValueError(f"Adding edge {vertex_id1!r} -> {vertex_id2!r} would create a cycle!")
+        # everything that reaches vertex_id1 and is placed after vertex_id2
+        backward = self.__search(vertex_id1, self.__predecessors,
+                                 lambda p: p > lower, None)
+
+        # the backward set must come first; both keep their relative order
+        backward.sort(key=position.__getitem__)
+        forward.sort(key=position.__getitem__)
+        moved = backward + forward
+        slots = sorted(position[vertex_id] for vertex_id in moved)
+        for vertex_id, slot in zip(moved, slots):
+            position[vertex_id] = slot
+            self.__order[slot] = vertex_id
+
+    def __search(self, start_id, neighbor_ids, in_region, cycle_id):
+        """
+        Return the vertex ids reachable from `start_id` through vertices whose
+        position satisfies `in_region`, or None if `cycle_id` is reached.
+        """
+        position = self.__position
+        seen = {start_id}
+        found = [start_id]
+        stack = [start_id]
+        while stack:
+            current_id = stack.pop()
+            for neighbor_id in neighbor_ids(current_id):
+                if neighbor_id == cycle_id:
+                    return None
+                if neighbor_id not in seen and in_region(position[neighbor_id]):
+                    seen.add(neighbor_id)
+                    found.append(neighbor_id)
+                    stack.append(neighbor_id)
+        return found
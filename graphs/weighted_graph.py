@@ -1,6 +1,17 @@
-from graphs.graph import Graph, Vertex
+import heapq
+import sys
+from operator import itemgetter
+
+from graphs.csr_graph import CSRGraph
+from graphs.disjoint_set import DisjointSet
+from graphs.graph import gc_paused
+from graphs.heuristics import HEURISTICS, zero_heuristic
+from graphs.indexed_heap import IndexedMinHeap
+from graphs.query_cache import QueryCache, cached_query
 
 class WeightedVertex(object):
+    __slots__ = ('__id', '__neighbors_dict')
+
     def __init__(self, vertex_id):
         """
         Initialize a vertex and its neighbors.
@@ -9,7 +20,7 @@ class WeightedVertex(object):
         vertex_id (string): A unique identifier to identify this vertex.
         """
         self.__id = vertex_id
-        self.__neighbors_dict = {} # id -> (obj, weight)
+        self.__neighbors_dict = {} # id -> weight
 
     def add_neighbor(self, vertex_obj, weight):
         """
@@ -19,33 +30,129 @@ class WeightedVertex(object):
         vertex_obj (Vertex): An instance of Vertex to be stored as a neighbor.
         weight (int): The edge weight from self -> neighbor.
         """
-        self.__neighbors_dict[self.__id] = (vertex_obj, weight)
+        self.__neighbors_dict[vertex_obj.__id] = weight
 
     def get_neighbors(self):
         """Return the neighbors of this vertex as a list of neighbor ids."""
-        output = []
-        for i in self.__neighbors_dict.values():
-          output.append(i[0].__id)
-        return output
+        return list(self.__neighbors_dict.keys())
 
     def get_neighbors_with_weights(self):
         """Return the neighbors of this vertex as a list of tuples of (neighbor_id, weight)."""
-        output = []
-        for i in self.__neighbors_dict.values():
-          output.append(i[0].__id, i[1])
-        return output
+        return list(self.__neighbors_dict.items())
+
+    def neighbor_ids(self):
+        """
+        Return a read-only, live view of the neighbor ids. It must not be
+        iterated while the vertex is being changed.
+        """
+        return self.__neighbors_dict.keys()
+
+    def iter_neighbors_with_weights(self):
+        """
+        Return a read-only, live view of (neighbor_id, weight) pairs, without
+        building a list.
+        """
+        return self.__neighbors_dict.items()
+
+    def get_weight(self, vertex_id):
+        """Return the weight of the edge to `vertex_id`, or None if there is none."""
+        return self.__neighbors_dict.get(vertex_id)
+
+    def degree(self):
+        """Return the number of neighbors of this vertex."""
+        return len(self.__neighbors_dict)
+
+    def memory_usage(self):
+        """Return the number of bytes used by this vertex and its neighbor storage."""
+        return sys.getsizeof(self) + sys.getsizeof(self.__neighbors_dict)
+
+    def get_id(self):
+        """Return the id of this vertex."""
+        return self.__id
+
+
+def _build_path(predecessors, target_id):
+    """Follow `predecessors` back from `target_id` and return the path from the start."""
+    path = [target_id]
+    while predecessors[path[-1]] is not None:
+        path.append(predecessors[path[-1]])
+    path.reverse()
+    return path
 
 
 class WeightedGraph(object):
-    def __init__(self, is_directed=True):
+    def __init__(self, is_directed=True, query_cache_size=0):
         """
         Initialize a weighted graph object with an empty vertex dictionary.
 
         Parameters:
         is_directed (boolean): Whether the graph is directed (edges go in only one direction).
+        query_cache_size (integer): How many query results to memoize. 0 turns
+        the query cache off.
         """
-        self.vertex_dict = {} # id -> object
+        self.__vertex_dict = {} # id -> object
         self.__is_directed = is_directed
+        self.__version = 0
+        self.__query_cache = QueryCache(query_cache_size) if query_cache_size else None
+
+    @classmethod
+    def from_weighted_edges(cls, edges, directed=True, vertex_ids=(), **options):
+        """
+        Build a weighted graph from an edge list in one pass. Vertices are
+        created the first time they are seen. A repeated edge keeps the
+        weight it was given last.
+
+        Parameters:
+        edges (iterable<(string, string, int)>): Tuples of (vertex_id1, vertex_id2, weight).
+        directed (boolean): Whether the graph is directed.
+        vertex_ids (iterable<string>): Vertices to add first, e.g. ones with no
+        edges. They come first in the graph's vertex order.
+        options: Passed on to WeightedGraph(), e.g. query_cache_size.
+
+        Returns:
+        WeightedGraph: The new graph.
+        """
+        graph = cls(is_directed=directed, **options)
+        vertex_dict = graph.__vertex_dict
+        is_directed = graph.__is_directed
+        with gc_paused():
+            for vertex_id in vertex_ids:
+                if vertex_id not in vertex_dict:
+                    vertex_dict[vertex_id] = WeightedVertex(vertex_id)
+
+            for vertex_id1, vertex_id2, weight in edges:
+                vertex1 = vertex_dict.get(vertex_id1)
+                if vertex1 is None:
+                    vertex1 = vertex_dict[vertex_id1] = WeightedVertex(vertex_id1)
+                vertex2 = vertex_dict.get(vertex_id2)
+                if vertex2 is None:
+                    vertex2 = vertex_dict[vertex_id2] = WeightedVertex(vertex_id2)
+                vertex1.add_neighbor(vertex2, weight)
+                if not is_directed:
+                    vertex2.add_neighbor(vertex1, weight)
+        graph.__version += 1
+        return graph
+
+    @classmethod
+    def from_adjacency(cls, adjacency, directed=True, **options):
+        """
+        Build a weighted graph from an adjacency mapping in one pass.
+
+        Parameters:
+        adjacency (dict<string, dict<string, int>>): Maps each vertex id to its
+        neighbors and the weight of the edge to each. A list of
+        (neighbor_id, weight) pairs works in place of the inner dict.
+        directed (boolean): Whether the graph is directed.
+        options: Passed on to WeightedGraph(), e.g. query_cache_size.
+
+        Returns:
+        WeightedGraph: The new graph.
+        """
+        edges = ((vertex_id, neighbor_id, weight)
+                 for vertex_id, neighbors in adjacency.items()
+                 for neighbor_id, weight in (neighbors.items() if hasattr(neighbors, 'items')
+                                             else neighbors))
+        return cls.from_weighted_edges(edges, directed, vertex_ids=adjacency, **options)
 
     def get_vertex(self, vertex_id):
         """Return the vertex if it exists."""
@@ -64,6 +171,21 @@ class WeightedGraph(object):
         """
         return list(self.__vertex_dict.values())
 
+    def vertices_view(self):
+        """
+        Return a read-only, live view of the vertex objects, without building a
+        list. It must not be iterated while vertices are being added.
+        """
+        return self.__vertex_dict.values()
+
+    def vertex_ids(self):
+        """Return a read-only, live view of the vertex ids."""
+        return self.__vertex_dict.keys()
+
+    def num_vertices(self):
+        """Return the number of vertices in the graph."""
+        return len(self.__vertex_dict)
+
     def add_vertex(self, vertex_id):
         """
         Add a new vertex object to the graph with the given key and return the vertex.
@@ -75,7 +197,8 @@ class WeightedGraph(object):
         Vertex: The new vertex object.
         """
         vertex = WeightedVertex(vertex_id)
-        self.vertex_dict[vertex_id] = vertex
+        self.__vertex_dict[vertex_id] = vertex
+        self.__version += 1
         return vertex
 
     def add_edge(self, vertex_id1, vertex_id2, weight):
@@ -85,136 +208,278 @@ class WeightedGraph(object):
         Parameters:
         vertex_id1 (string): The unique identifier of the first vertex.
         vertex_id2 (string): The unique identifier of the second vertex.
+        weight (int): The edge weight.
+        """
+        if vertex_id1 not in self.__vertex_dict or vertex_id2 not in self.__vertex_dict:
+            raise KeyError("One or both vertices are not in the graph!")
+        vertex1 = self.__vertex_dict[vertex_id1]
+        vertex2 = self.__vertex_dict[vertex_id2]
+        vertex1.add_neighbor(vertex2, weight)
+        if not self.__is_directed:
+            vertex2.add_neighbor(vertex1, weight)
+        self.__version += 1
+
+    def contains_id(self, vertex_id):
+        return vertex_id in self.__vertex_dict
+
+    def is_directed(self):
+        """Return True if the graph is directed."""
+        return self.__is_directed
+
+    def memory_usage(self):
         """
-        self.vertex_dict[vertex_id1].add_neighbor(vertex_id2, weight)
+        Estimate the memory used by the graph's vertices and edges.
 
-    def union(self, parent_map, vertex_id1, vertex_id2):
-        """Combine vertex_id1 and vertex_id2 into the same group."""
-        vertex1_root = self.find(parent_map, vertex_id1)
-        vertex2_root = self.find(parent_map, vertex_id2)
-        parent_map[vertex1_root] = vertex2_root
+        Returns:
+        dict: The number of vertices and stored edges, and the bytes used by
+        the vertex objects with their neighbor storage, the lookup table and
+        the id strings, plus their total.
+        """
+        vertex_dict = self.__vertex_dict
+        vertex_bytes = sum(vertex.memory_usage() for vertex in vertex_dict.values())
+        table_bytes = sys.getsizeof(vertex_dict)
+        id_bytes = sum(sys.getsizeof(vertex_id) for vertex_id in vertex_dict)
+
+        return {
+            'vertices': len(vertex_dict),
+            'edges': sum(vertex.degree() for vertex in vertex_dict.values()),
+            'vertex_bytes': vertex_bytes,
+            'table_bytes': table_bytes,
+            'id_bytes': id_bytes,
+            'total_bytes': vertex_bytes + table_bytes + id_bytes,
+        }
+
+    def get_version(self):
+        """Return the mutation counter, which goes up on every change to the graph."""
+        return self.__version
+
+    def get_query_cache(self):
+        """Return the QueryCache used for this graph, or None if caching is off."""
+        return self.__query_cache
+
+    def query_cache_stats(self):
+        """Return the hit, miss and eviction counters of the query cache, or None."""
+        if self.__query_cache is None:
+            return None
+        return self.__query_cache.stats()
+
+    @cached_query
+    def freeze(self):
+        """
+        Return an immutable, array-backed copy of this graph.
+
+        Returns:
+        CSRGraph: A compressed sparse row form of the graph, with weights.
+        """
+        return CSRGraph.from_weighted_graph(self)
 
+    def get_edges(self):
+        """
+        Return every edge in the graph as tuples of (start_id, dest_id, weight).
+        Undirected edges are listed once.
+        """
+        vertex_dict = self.__vertex_dict
+        if self.__is_directed:
+            return [(vertex_id, neighbor_id, weight)
+                    for vertex_id, vertex in vertex_dict.items()
+                    for neighbor_id, weight in vertex.iter_neighbors_with_weights()]
 
-    def find(self, parent_map, vertex_id):
-        """Get the root (or, group label) for vertex_id."""
-        if(parent_map[vertex_id] == vertex_id):
-            return vertex_id
-        return self.find(parent_map, parent_map[vertex_id])
+        # keep each undirected edge only from the endpoint that comes first
+        position = {vertex_id: i for i, vertex_id in enumerate(vertex_dict)}
+        return [(vertex_id, neighbor_id, weight)
+                for i, (vertex_id, vertex) in enumerate(vertex_dict.items())
+                for neighbor_id, weight in vertex.iter_neighbors_with_weights()
+                if position[neighbor_id] >= i]
 
+    @cached_query
     def minimum_spanning_tree_kruskal(self):
         """
         Use Kruskal's Algorithm to return a list of edges, as tuples of 
         (start_id, dest_id, weight) in the graph's minimum spanning tree.
+        If the graph is disconnected, the edges of a minimum spanning forest
+        are returned instead.
         """
-        # TODO: Create a list of all edges in the graph, sort them by weight 
-        # from smallest to largest
-        def sortFunc(e):
-            return e[2]
-        def sortFunc2(e):
-            return e[0]
-
-        edges = []
-        for vertex in self.get_vertices():
-            for neighbor, weight in vertex.get_neighbors_with_weights():
-                if ((neighbor, vertex.__id, weight) not in edges):
-                    edges.append((vertex.__id, neighbor, weight))
-        edges.sort(reverse=True, key=sortFunc2)
-        edges.sort(reverse=True, key=sortFunc)
-        
-
+        edges = self.get_edges()
+        edges.sort(key=itemgetter(2))
 
-        # TODO: Create a dictionary `parent_map` to map vertex -> its "parent". 
-        # Initialize it so that each vertex is its own parent.
-        parent_map = {vertex.__id: vertex.__id for vertex in self.get_vertices()}
-        
-        # TODO: Create an empty list to hold the solution (i.e. all edges in the 
-        # final spanning tree)
+        groups = DisjointSet(self.__vertex_dict)
+        target_size = len(self.__vertex_dict) - 1
         solution = []
-        # TODO: While the spanning tree holds < V-1 edges, get the smallest 
-        # edge. If the two vertices connected by the edge are in different sets 
-        # (i.e. calling `find()` gets two different roots), then it will not 
-        # create a cycle, so add it to the solution set and call `union()` on 
-        # the two vertices.
-        while len(solution) < len(self.get_vertices()) - 1 and len(edges) > 0:
-            current_edge = edges.pop()
-            group1 = self.find(parent_map, current_edge[0])
-            group2 = self.find(parent_map, current_edge[1])
-            if group1 != group2:
-                self.union(parent_map, current_edge[0], current_edge[1])
-                solution.append(current_edge)
-        # TODO: Return the solution list.
+        for edge in edges:
+            if groups.union(edge[0], edge[1]):
+                solution.append(edge)
+                if len(solution) == target_size:
+                    break
         return solution
-    
-    def minimum_spanning_tree_prim(self):
+
+    @cached_query
+    def minimum_spanning_tree_prim(self, return_edges=False):
         """
         Use Prim's Algorithm to return the total weight of all edges in the
-        graph's spanning tree.
-        Assume that the graph is connected.
-        """
-        # TODO: Create a dictionary `vertex_to_weight` and initialize all
-        # vertices to INFINITY - hint: use `float('inf')`
-        vertex_to_weight = {vertex.__id: float("inf") for vertex in self.get_vertices()}
-        # TODO: Choose one vertex and set its weight to 0
-        start_vertex = list(vertex_to_weight.keys())[0]
-        vertex_to_weight[start_vertex] = 0
-        edges = [(start_vertex, edge_id, weight) for edge_id, weight in self.get_vertex(start_vertex).get_neighbors_with_weights()]
-        print(edges)
-        # TODO: While `vertex_to_weight` is not empty:
-        # 1. Get the minimum-weighted remaining vertex, remove it from the
-        #    dictionary, & add its weight to the total MST weight
-        # 2. Update that vertex's neighbors, if edge weights are smaller than
-        #    previous weights
-        parent_map = {vertex.__id: vertex.__id for vertex in self.get_vertices()}
-        solution = []
-        def sortFunc(e):
-            return e[2]
-        edges.sort(reverse=True, key=sortFunc)
-        while len(solution) < len(self.get_vertices()) - 1 and len(edges) > 0:
-            print(edges)
-            current_edge = edges.pop()
-            group1 = self.find(parent_map, current_edge[0])
-            group2 = self.find(parent_map, current_edge[1])
-            if group1 != group2:
-                self.union(parent_map, current_edge[0], current_edge[1])
-                solution.append(current_edge)
-                for new_edge, weight in self.get_vertex(current_edge[1]).get_neighbors_with_weights():
-                    edges.append((current_edge[1], new_edge, weight))
-                    edges.sort(reverse=True, key=sortFunc)
+        graph's spanning tree. If the graph is disconnected, a minimum spanning
+        forest is grown from one start vertex per component.
+
+        Parameters:
+        return_edges (boolean): Also return the edges of the tree.
+
+        Returns:
+        int: The total weight of the tree. If `return_edges` is True, a tuple of
+        (weight, list<(start_id, dest_id, weight)>) instead.
+        """
+        in_tree = set()
+        parent = {} # vertex id -> id of the tree vertex it would attach to
         total = 0
-        for edge in solution:
-            total += edge[2]
+        solution = []
+
+        for start_id in self.__vertex_dict:
+            if start_id in in_tree:
+                continue
+
+            heap = IndexedMinHeap()
+            heap.push(start_id, 0)
+            while heap:
+                current_id, weight = heap.pop()
+                in_tree.add(current_id)
+                if current_id != start_id:
+                    total += weight
+                    solution.append((parent[current_id], current_id, weight))
+
+                for neighbor_id, edge_weight in self.__vertex_dict[current_id].iter_neighbors_with_weights():
+                    if neighbor_id not in in_tree and heap.push(neighbor_id, edge_weight):
+                        parent[neighbor_id] = current_id
+
+        if return_edges:
+            return total, solution
         return total
 
-                    
-        print(solution)
-        # TODO: Return total weight of MST
+    def __dijkstra(self, start_id, target_id=None):
+        """
+        Run Dijkstra's Algorithm from `start_id` using a binary heap with lazy
+        deletion: stale heap entries are skipped when popped instead of being
+        removed. Stops as soon as `target_id` is settled, if one is given.
+
+        Returns:
+        (dict, dict): The settled distances and the predecessor of each
+        settled vertex (the start vertex maps to None).
+        """
+        distances = {}
+        predecessors = {start_id: None}
+        best = {start_id: 0}
+        heap = [(0, start_id)]
+
+        while heap:
+            distance, current_id = heapq.heappop(heap)
+            if current_id in distances:
+                continue # stale entry
+            distances[current_id] = distance
+            if current_id == target_id:
+                break
+
+            for neighbor_id, weight in self.__vertex_dict[current_id].iter_neighbors_with_weights():
+                if neighbor_id in distances:
+                    continue
+                new_distance = distance + weight
+                if new_distance < best.get(neighbor_id, float('inf')):
+                    best[neighbor_id] = new_distance
+                    predecessors[neighbor_id] = current_id
+                    heapq.heappush(heap, (new_distance, neighbor_id))
+
+        return distances, predecessors
 
-    def find_shortest_path(self, start_id, target_id):
+    @cached_query
+    def find_shortest_path(self, start_id, target_id, return_path=False):
         """
         Use Dijkstra's Algorithm to return the total weight of the shortest path
         from a start vertex to a destination.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        target_id (string): The id of the target (end) vertex.
+        return_path (boolean): Also return the list of vertex ids on the path.
+
+        Returns:
+        int: The total weight of the path, or None if the target is unreachable.
+        If `return_path` is True, a tuple of (weight, list<string>) instead,
+        or (None, None) if the target is unreachable.
+        """
+        if not self.contains_id(start_id) or not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+
+        distances, predecessors = self.__dijkstra(start_id, target_id)
+        if target_id not in distances:
+            return (None, None) if return_path else None
+        if not return_path:
+            return distances[target_id]
+
+        return distances[target_id], _build_path(predecessors, target_id)
+
+    @cached_query
+    def single_source_distances(self, start_id):
+        """
+        Use Dijkstra's Algorithm to find the shortest distance from a start
+        vertex to every vertex reachable from it.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+
+        Returns:
+        dict: Vertex id -> total weight of the shortest path from the start.
         """
-        # TODO: Create a dictionary `vertex_to_distance` and initialize all
-        # vertices to INFINITY - hint: use `float('inf')`
-        vertex_to_distance = {i.__id: float("inf") for i in self.get_vertices()}
-        vertex_to_distance[start_id] = 0
-
-        # TODO: While `vertex_to_distance` is not empty:
-        # 1. Get the minimum-distance remaining vertex, remove it from the
-        #    dictionary. If it is the target vertex, return its distance.
-        # 2. Update that vertex's neighbors by adding the edge weight to the
-        #    vertex's distance, if it is lower than previous.
-        while(vertex_to_distance):
-            bestVert = (start_id, float("inf"))
-            for vert_id, dist in vertex_to_distance.items():
-                if dist < bestVert[1]:
-                    bestVert = (vert_id, dist)
-            if(bestVert[0] == target_id):
-                return bestVert[1]
-
-            del vertex_to_distance[bestVert[0]]
-            for neighbor, weight in self.get_vertex(bestVert[0]).get_neighbors_with_weights():
-                if(neighbor in vertex_to_distance):
-                    vertex_to_distance[neighbor] = min(vertex_to_distance[neighbor], weight + bestVert[1])
-        # TODO: Return None if target vertex not found.
-        return None
\ No newline at end of file
+        if not self.contains_id(start_id):
+            raise KeyError("Vertex is not in the graph!")
+
+        distances, _ = self.__dijkstra(start_id)
+        return distances
+
+    def astar(self, start_id, target_id, heuristic=None, coordinates=None, metric='euclidean'):
+        """
+        Use A* search to find the shortest path from a start vertex to a
+        destination, exploring vertices in order of distance so far plus the
+        heuristic's estimate of the distance left.
+
+        Parameters:
+        start_id (string): The id of the start vertex.
+        target_id (string): The id of the target (end) vertex.
+        heuristic (function): Called as heuristic(vertex_id, target_id); must
+        never overestimate. See graphs/heuristics.py.
+        coordinates (dict): Vertex id -> position, used to build a `metric`
+        heuristic when no `heuristic` is given.
+        metric (string): 'euclidean' or 'manhattan'.
+
+        Returns:
+        (int, list<string>, int): The total weight of the path, the vertex ids
+        on it, and how many vertices were expanded. The weight and path are
+        None if the target is unreachable.
+        """
+        if not self.contains_id(start_id) or not self.contains_id(target_id):
+            raise KeyError("One or both vertices are not in the graph!")
+        if heuristic is None:
+            if coordinates is None:
+                heuristic = zero_heuristic
+            elif metric in HEURISTICS:
+                heuristic = HEURISTICS[metric](coordinates)
+            else:
+                raise ValueError(f"Unknown metric {metric!r}")
+
+        best = {start_id: 0} # vertex id -> shortest distance found so far
+        predecessors = {start_id: None}
+        heap = [(heuristic(start_id, target_id), 0, start_id)]
+        expanded = 0
+
+        while heap:
+            _, distance, current_id = heapq.heappop(heap)
+            if distance > best[current_id]:
+                continue # stale entry
+            if current_id == target_id:
+                return distance, _build_path(predecessors, target_id), expanded
+            expanded += 1
+
+            for neighbor_id, weight in self.__vertex_dict[current_id].iter_neighbors_with_weights():
+                new_distance = distance + weight
+                if new_distance < best.get(neighbor_id, float('inf')):
+                    best[neighbor_id] = new_distance
+                    predecessors[neighbor_id] = current_id
+                    estimate = new_distance + heuristic(neighbor_id, target_id)
+                    heapq.heappush(heap, (estimate, new_distance, neighbor_id))
+
+        return None, None, expanded
@@ -0,0 +1,45 @@
+import unittest
+from graphs.graph import Graph
+from util.file_reader import read_graph_from_file
+
+
+class TestBatchQueries(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = read_graph_from_file('test_files/graph_medium_undirected.txt')
+
+    def test_batch_shortest_paths(self):
+        pairs = [('A', 'F'), ('B', 'C'), ('A', 'A'), ('F', 'A'), ('A', 'D')]
+
+        for workers in (1, 2):
+            paths = list(self.graph.batch_shortest_paths(pairs, workers=workers))
+            self.assertEqual([len(path) for path in paths], [4, 2, 1, 4, 3])
+            for (start_id, target_id), path in zip(pairs, paths):
+                self.assertEqual(path[0], start_id)
+                self.assertEqual(path[-1], target_id)
+
+    def test_batch_vertices_n_away(self):
+        queries = [('A', 2), ('A', 1), ('F', 1), ('A', 3), ('A', 0)]
+
+        for workers in (1, 2):
+            results = list(self.graph.batch_vertices_n_away(queries, workers=workers))
+            self.assertEqual([sorted(result) for result in results],
+                             [['D', 'E'], ['B', 'C'], ['D', 'E'], ['F'], ['A']])
+
+    def test_interleaved_batches(self):
+        triangle = Graph.from_edges([('A', 'B'), ('B', 'C'), ('A', 'C')], directed=False)
+        chain = Graph.from_edges([('A', 'B'), ('B', 'C')], directed=False)
+
+        triangle_paths = triangle.batch_shortest_paths([('B', 'C'), ('A', 'C')])
+        chain_paths = chain.batch_shortest_paths([('A', 'C')])
+        self.assertEqual(next(triangle_paths), ['B', 'C'])
+        self.assertEqual(next(chain_paths), ['A', 'B', 'C'])
+        self.assertEqual(next(triangle_paths), ['A', 'C'])
+
+    def test_missing_vertex(self):
+        with self.assertRaises(KeyError):
+            list(self.graph.batch_shortest_paths([('A', 'Z')]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+from graphs.weighted_graph import WeightedGraph
+from util.binary_format import load_binary, save_binary
+from util.file_reader import read_graph_from_file
+
+
+class TestBinaryFormat(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.filename = tempfile.mkstemp(suffix='.csrg')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_round_trip_graph(self):
+        graph = read_graph_from_file('test_files/graph_medium_undirected.txt')
+        save_binary(graph, self.filename)
+
+        for use_mmap in (True, False):
+            loaded = load_binary(self.filename, use_mmap=use_mmap)
+            self.assertFalse(loaded.is_directed())
+            self.assertFalse(loaded.is_weighted())
+            self.assertEqual(loaded.get_vertices(), ['A', 'B', 'C', 'D', 'E', 'F'])
+            self.assertEqual(sorted(loaded.get_neighbors('D')), ['B', 'C', 'E', 'F'])
+            self.assertEqual(len(loaded.find_shortest_path('A', 'F')), 4)
+
+    def test_round_trip_weighted_graph(self):
+        graph = WeightedGraph(is_directed=True)
+        for vertex_id in 'ABC':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A', 'B', 2.5)
+        graph.add_edge('B', 'C', 4)
+        save_binary(graph, self.filename)
+
+        loaded = load_binary(self.filename)
+        self.assertTrue(loaded.is_directed())
+        self.assertEqual(loaded.get_neighbors_with_weights('A'), [('B', 2.5)])
+        self.assertEqual(loaded.get_neighbors_with_weights('C'), [])
+
+    def test_rejects_other_files(self):
+        with open(self.filename, 'wb') as my_file:
+            my_file.write(b'G\nA,B\n(A,B)\n' * 10)
+
+        with self.assertRaises(ValueError):
+            load_binary(self.filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
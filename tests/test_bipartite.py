@@ -0,0 +1,74 @@
+import unittest
+from graphs.bipartite import two_color
+from graphs.graph import Graph
+from util import generators
+
+
+def assert_odd_cycle(test, graph, cycle):
+    test.assertEqual(len(cycle) % 2, 1)
+    for vertex_id, next_id in zip(cycle, cycle[1:] + cycle[:1]):
+        test.assertTrue(graph.get_vertex(vertex_id).has_neighbor(next_id) or
+                        graph.get_vertex(next_id).has_neighbor(vertex_id))
+
+
+class TestBipartite(unittest.TestCase):
+
+    def test_partition(self):
+        graph = generators.grid(4, 5)
+        (left, right), odd_cycle = graph.bipartition()
+
+        self.assertIsNone(odd_cycle)
+        self.assertEqual(len(left) + len(right), 20)
+        side = {vertex_id: 0 for vertex_id in left}
+        side.update((vertex_id, 1) for vertex_id in right)
+        for vertex in graph.get_vertices():
+            for neighbor_id in vertex.neighbor_ids():
+                self.assertNotEqual(side[vertex.get_id()], side[neighbor_id])
+
+    def test_every_component(self):
+        # the first component is fine, the triangle comes later
+        graph = Graph.from_edges([('A', 'B'), ('C', 'D'), ('D', 'E'), ('E', 'C')],
+                                 directed=False)
+        self.assertFalse(graph.is_bipartite())
+        partition, odd_cycle = graph.bipartition()
+        self.assertIsNone(partition)
+        self.assertEqual(sorted(odd_cycle), ['C', 'D', 'E'])
+
+        graph = Graph.from_edges([('A', 'B')], directed=False, vertex_ids='Z')
+        graph.add_edge('Z', 'Z')
+        self.assertEqual(graph.bipartition(), (None, ['Z']))
+
+    def test_odd_cycle_witness(self):
+        graph = generators.erdos_renyi(200, 300, seed=7)
+        partition, odd_cycle = graph.bipartition()
+        self.assertIsNone(partition)
+        assert_odd_cycle(self, graph, odd_cycle)
+
+    def test_directed(self):
+        # direction is ignored, whichever endpoint is colored first
+        graph = Graph.from_edges([('C', 'B')], vertex_ids=['B'])
+        self.assertTrue(graph.is_bipartite())
+        self.assertTrue(graph.freeze().is_bipartite())
+
+        graph = Graph.from_edges([('A', 'B'), ('B', 'C'), ('A', 'C')])
+        self.assertFalse(graph.is_bipartite())
+        assert_odd_cycle(self, graph, graph.bipartition()[1])
+
+    def test_empty_graph(self):
+        self.assertTrue(Graph().is_bipartite())
+        self.assertEqual(Graph().bipartition(), (([], []), None))
+
+    def test_integer_adjacency(self):
+        adjacency = [[1, 3], [0, 2], [1, 3], [2, 0]]
+        color, odd_cycle = two_color(4, adjacency.__getitem__)
+        self.assertIsNone(odd_cycle)
+        self.assertEqual(list(color), [1, 2, 1, 2])
+
+        adjacency = [[1], [0, 2], [1, 3, 4], [2, 4], [2, 3]]
+        color, odd_cycle = two_color(5, adjacency.__getitem__)
+        self.assertIsNone(color)
+        self.assertEqual(sorted(odd_cycle), [2, 3, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
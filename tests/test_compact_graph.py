@@ -0,0 +1,75 @@
+import unittest
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedVertex
+from util import generators
+
+
+def build(compact):
+    graph = Graph(is_directed=False, compact=compact)
+    source = generators.erdos_renyi(200, 600, seed=4)
+    for vertex_id in source.vertex_ids():
+        graph.add_vertex(vertex_id)
+    graph.add_edges((vertex.get_id(), neighbor_id)
+                    for vertex in source.vertices_view()
+                    for neighbor_id in vertex.neighbor_ids())
+    return graph
+
+
+class TestCompactGraph(unittest.TestCase):
+
+    def test_same_answers_as_regular_graph(self):
+        regular = build(compact=False)
+        compact = build(compact=True)
+
+        self.assertTrue(compact.is_compact())
+        self.assertEqual(len(compact.find_shortest_path('0', '199')),
+                         len(regular.find_shortest_path('0', '199')))
+        self.assertEqual(sorted(compact.find_vertices_n_away('0', 2)),
+                         sorted(regular.find_vertices_n_away('0', 2)))
+        self.assertEqual(compact.is_bipartite(), regular.is_bipartite())
+        self.assertEqual(compact.freeze().num_edges(), regular.freeze().num_edges())
+
+    def test_compact_vertex(self):
+        graph = Graph(is_directed=True, compact=True)
+        vertex_a = graph.add_vertex('A')
+        graph.add_vertex('B')
+        graph.add_edge('A', 'B')
+        graph.add_edge('A', 'B')
+
+        self.assertEqual(vertex_a.degree(), 1)
+        self.assertEqual(list(vertex_a.neighbor_ids()), ['B'])
+        self.assertIn('B', vertex_a.neighbor_ids())
+        self.assertNotIn('C', vertex_a.neighbor_ids())
+        self.assertEqual([v.get_id() for v in vertex_a.get_neighbors()], ['B'])
+
+    def test_hub(self):
+        graph = Graph(is_directed=True, compact=True)
+        hub = graph.add_vertex('hub')
+        for i in range(5000):
+            graph.add_vertex(str(i))
+        graph.add_edges(('hub', str(i)) for i in range(5000))
+        for i in range(0, 5000, 2):
+            graph.add_edge('hub', str(i))
+
+        self.assertEqual(hub.degree(), 5000)
+        self.assertEqual(list(hub.neighbor_ids())[:3], ['0', '1', '2'])
+        graph.add_edge('hub', '7')
+        self.assertEqual(graph.freeze().num_edges(), 5000)
+        self.assertEqual(graph.memory_usage()['edges'], 5000)
+
+    def test_memory_usage(self):
+        regular = build(compact=False).memory_usage()
+        compact = build(compact=True).memory_usage()
+
+        self.assertEqual(regular['edges'], 1200)
+        self.assertEqual(compact['edges'], 1200)
+        self.assertLess(compact['vertex_bytes'], regular['vertex_bytes'])
+
+    def test_vertices_have_no_instance_dict(self):
+        graph = Graph()
+        self.assertFalse(hasattr(graph.add_vertex('A'), '__dict__'))
+        self.assertFalse(hasattr(WeightedVertex('A'), '__dict__'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from graphs.graph import Graph
+
+
+class TestTrackedComponents(unittest.TestCase):
+
+    def test_components_follow_inserts(self):
+        graph = Graph(is_directed=False, track_components=True)
+        for vertex_id in 'ABCDE':
+            graph.add_vertex(vertex_id)
+        self.assertEqual(graph.component_count(), 5)
+
+        graph.add_edge('A', 'B')
+        graph.add_edges([('C', 'D'), ('D', 'E')])
+        self.assertEqual(graph.component_count(), 2)
+        self.assertTrue(graph.same_component('C', 'E'))
+        self.assertFalse(graph.same_component('A', 'E'))
+        self.assertEqual(graph.component_of('A'), graph.component_of('B'))
+
+        graph.add_edge('B', 'C')
+        self.assertEqual(graph.component_count(), 1)
+        self.assertEqual(sorted(graph.find_connected_components()[0]), list('ABCDE'))
+
+    def test_matches_traversal(self):
+        tracked = Graph(is_directed=False, track_components=True)
+        untracked = Graph(is_directed=False)
+        for graph in (tracked, untracked):
+            for vertex_id in range(10):
+                graph.add_vertex(vertex_id)
+            graph.add_edges([(0, 1), (2, 3), (3, 4), (5, 5), (6, 9)])
+
+        def normalize(components):
+            return sorted(sorted(component) for component in components)
+
+        self.assertEqual(normalize(tracked.find_connected_components()),
+                         normalize(untracked.find_connected_components()))
+
+    def test_requires_tracking(self):
+        with self.assertRaises(ValueError):
+            Graph(is_directed=True, track_components=True)
+        with self.assertRaises(ValueError):
+            Graph(is_directed=False).component_count()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from graphs.graph import Graph
+from util.file_reader import read_graph_from_file
+
+
+class TestCSRGraph(unittest.TestCase):
+
+    def test_freeze_keeps_vertices_and_edges(self):
+        graph = read_graph_from_file('test_files/graph_small_directed.txt')
+        frozen = graph.freeze()
+
+        self.assertEqual(frozen.num_vertices(), 4)
+        self.assertEqual(frozen.num_edges(), 3)
+        self.assertEqual(frozen.get_neighbors('2'), ['4'])
+        self.assertEqual(frozen.get_neighbors('4'), [])
+
+    def test_find_shortest_path(self):
+        graph = read_graph_from_file('test_files/graph_medium_undirected.txt')
+        frozen = graph.freeze()
+
+        path = frozen.find_shortest_path('A', 'F')
+        self.assertEqual(len(path), 4)
+        self.assertEqual(path[0], 'A')
+        self.assertEqual(path[-1], 'F')
+
+    def test_find_vertices_n_away(self):
+        graph = read_graph_from_file('test_files/graph_medium_undirected.txt')
+        frozen = graph.freeze()
+
+        self.assertEqual(sorted(frozen.find_vertices_n_away('A', 1)), ['B', 'C'])
+        self.assertEqual(sorted(frozen.find_vertices_n_away('A', 2)), ['D', 'E'])
+        self.assertEqual(frozen.find_vertices_n_away('A', 3), ['F'])
+
+    def test_components_and_bipartite(self):
+        graph = Graph(is_directed=False)
+        for vertex_id in 'ABCDE':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A', 'B')
+        graph.add_edge('C', 'D')
+        graph.add_edge('D', 'E')
+        graph.add_edge('E', 'C')
+        frozen = graph.freeze()
+
+        components = sorted(sorted(c) for c in frozen.find_connected_components())
+        self.assertEqual(components, [['A', 'B'], ['C', 'D', 'E']])
+        self.assertFalse(frozen.is_bipartite())
+
+    def test_topological_sort(self):
+        graph = Graph(is_directed=True)
+        for vertex_id in 'ABCD':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A', 'B')
+        graph.add_edge('B', 'C')
+        graph.add_edge('A', 'D')
+        graph.add_edge('D', 'C')
+
+        order = graph.freeze().topological_sort()
+        self.assertEqual(order[0], 'A')
+        self.assertEqual(order[-1], 'C')
+
+        graph.add_edge('C', 'A')
+        with self.assertRaises(ValueError):
+            graph.freeze().topological_sort()
+
+
+if __name__ == '__main__':
+    unittest.main()
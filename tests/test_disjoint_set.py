@@ -0,0 +1,40 @@
+import unittest
+from graphs.disjoint_set import DisjointSet
+
+
+class TestDisjointSet(unittest.TestCase):
+
+    def test_union_and_find(self):
+        groups = DisjointSet('ABCDE')
+        self.assertEqual(groups.count(), 5)
+
+        self.assertTrue(groups.union('A', 'B'))
+        self.assertTrue(groups.union('C', 'D'))
+        self.assertFalse(groups.union('B', 'A'))
+
+        self.assertTrue(groups.connected('A', 'B'))
+        self.assertFalse(groups.connected('A', 'C'))
+        self.assertEqual(groups.count(), 3)
+        self.assertEqual(groups.group_size('D'), 2)
+
+    def test_long_chain_does_not_recurse(self):
+        groups = DisjointSet(range(100000))
+        for i in range(1, 100000):
+            groups.union(i - 1, i)
+
+        self.assertEqual(groups.count(), 1)
+        self.assertTrue(groups.connected(0, 99999))
+
+    def test_add_and_groups(self):
+        groups = DisjointSet()
+        groups.add('A')
+        groups.add('B')
+        groups.add('A')
+        self.assertEqual(len(groups), 2)
+
+        groups.union('A', 'B')
+        self.assertEqual(groups.groups(), [['A', 'B']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from graphs import frontier
+from graphs.graph import Graph
+from util.file_reader import read_graph_from_file
+
+
+@unittest.skipUnless(frontier.np is not None, "NumPy is not installed")
+class TestFrontierBFS(unittest.TestCase):
+
+    def setUp(self):
+        graph = read_graph_from_file('test_files/graph_medium_undirected.txt')
+        self.bfs = frontier.FrontierBFS(graph.freeze())
+
+    def test_k_hop(self):
+        self.assertEqual(self.bfs.k_hop('A', 0), ['A'])
+        self.assertEqual(sorted(self.bfs.k_hop('A', 1)), ['B', 'C'])
+        self.assertEqual(sorted(self.bfs.k_hop('A', 2)), ['D', 'E'])
+        self.assertEqual(self.bfs.k_hop('A', 3), ['F'])
+        self.assertEqual(self.bfs.k_hop('A', 4), [])
+
+    def test_k_hop_ball(self):
+        self.assertEqual(sorted(self.bfs.k_hop_ball('A', 2)), ['A', 'B', 'C', 'D', 'E'])
+
+    def test_multi_source(self):
+        self.assertEqual(sorted(self.bfs.multi_source_k_hop(['A', 'F'], 1)),
+                         ['B', 'C', 'D', 'E'])
+        self.assertEqual(self.bfs.distances(['A', 'F'], 1),
+                         {'A': 0, 'F': 0, 'B': 1, 'C': 1, 'D': 1, 'E': 1})
+
+    def test_matches_find_vertices_n_away(self):
+        graph = Graph(is_directed=True)
+        for i in range(50):
+            graph.add_vertex(i)
+        graph.add_edges((i, (i * 7 + 3) % 50) for i in range(50))
+        graph.add_edges((i, (i * i + 1) % 50) for i in range(50))
+        bfs = frontier.FrontierBFS(graph.freeze())
+
+        for k in range(6):
+            self.assertEqual(sorted(bfs.k_hop(0, k)), sorted(graph.find_vertices_n_away(0, k)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from benchmarks.run_benchmarks import BENCHMARKS, run_benchmark
+from util import generators
+from util.file_reader import read_graph_from_file, write_graph_to_file
+
+
+def count_edges(graph):
+    return sum(len(vertex.get_neighbors()) for vertex in graph.get_vertices())
+
+
+class TestGenerators(unittest.TestCase):
+
+    def test_erdos_renyi_is_seeded(self):
+        graph1 = generators.erdos_renyi(50, 100, seed=1)
+        graph2 = generators.erdos_renyi(50, 100, seed=1)
+
+        self.assertEqual(len(graph1.get_vertices()), 50)
+        self.assertEqual(count_edges(graph1), 200)
+        self.assertEqual(str(graph1), str(graph2))
+
+    def test_shapes(self):
+        self.assertEqual(count_edges(generators.grid(3, 4)), 2 * 17)
+        self.assertTrue(generators.grid(3, 4).is_bipartite())
+        self.assertEqual(count_edges(generators.chain(10)), 9)
+        self.assertEqual(count_edges(generators.barabasi_albert(30, 2)), 2 * 2 * 28)
+        self.assertEqual(len(generators.random_dag(40, 100).topological_sort()), 40)
+
+    def test_random_weighted_is_connected(self):
+        graph = generators.random_weighted(30, 60, seed=3)
+
+        self.assertEqual(len(graph.get_edges()), 60)
+        self.assertEqual(len(generators.random_weighted(10, 45).get_edges()), 45)
+        with self.assertRaises(ValueError):
+            generators.random_weighted(10, 46)
+        self.assertEqual(len(graph.minimum_spanning_tree_kruskal()), 29)
+        self.assertEqual(len(graph.single_source_distances('0')), 30)
+
+    def test_write_graph_to_file(self):
+        graph = generators.erdos_renyi(20, 30, seed=2)
+        handle, filename = tempfile.mkstemp(suffix='.txt')
+        os.close(handle)
+        try:
+            write_graph_to_file(graph, filename)
+            self.assertEqual(str(read_graph_from_file(filename)), str(graph))
+        finally:
+            os.remove(filename)
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_every_benchmark_runs(self):
+        for name in BENCHMARKS:
+            result = run_benchmark(name, 50, repeat=1)
+            self.assertEqual(result['benchmark'], name)
+            self.assertGreaterEqual(result['seconds'], 0)
+            self.assertGreater(result['peak_bytes'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
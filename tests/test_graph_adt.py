@@ -1,6 +1,7 @@
+import io
 import unittest
 from graphs.graph import Graph
-from util.file_reader import read_graph_from_file
+from util.file_reader import read_edges, read_graph_from_file
 
 
 class TestGraph(unittest.TestCase):
@@ -37,6 +38,59 @@ class TestGraph(unittest.TestCase):
         self.assertEqual(len(vertex_b.get_neighbors()), 2)
         self.assertEqual(len(vertex_c.get_neighbors()), 2)
 
+    def test_add_edges(self):
+        graph = Graph(is_directed=False)
+        for vertex_id in 'ABC':
+            graph.add_vertex(vertex_id)
+        graph.add_edges(iter([('A', 'B'), ('B', 'C')]))
+
+        self.assertEqual(len(graph.get_vertex('A').get_neighbors()), 1)
+        self.assertEqual(len(graph.get_vertex('B').get_neighbors()), 2)
+
+    def test_add_edge_missing_vertex(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertex('A')
+        with self.assertRaisesRegex(KeyError, 'not in the graph'):
+            graph.add_edge('A', 'B')
+        with self.assertRaisesRegex(KeyError, "'B' is not in the graph"):
+            graph.add_edges([('A', 'B')])
+
+    def test_from_edges(self):
+        edges = [('A', 'B'), ('B', 'C'), ('A', 'B'), ('C', 'A')]
+        for compact in (False, True):
+            graph = Graph.from_edges(edges, directed=False, vertex_ids=['Z'],
+                                     compact=compact, track_components=True)
+            self.assertEqual(list(graph.vertex_ids()), ['Z', 'A', 'B', 'C'])
+            self.assertEqual(sorted(graph.get_vertex('A').neighbor_ids()), ['B', 'C'])
+            self.assertEqual(graph.component_count(), 2)
+
+            directed = Graph.from_edges(edges, compact=compact)
+            self.assertEqual(list(directed.get_vertex('A').neighbor_ids()), ['B'])
+            self.assertEqual(directed.freeze().num_edges(), 3)
+
+    def test_from_adjacency(self):
+        graph = Graph.from_adjacency({'A': ['B', 'C'], 'B': ['C'], 'D': []})
+
+        self.assertEqual(list(graph.vertex_ids()), ['A', 'B', 'D', 'C'])
+        self.assertEqual(graph.find_shortest_path('A', 'C'), ['A', 'C'])
+        self.assertEqual(graph.get_vertex('D').degree(), 0)
+
+    def test_views(self):
+        graph = Graph(is_directed=True)
+        vertex_a = graph.add_vertex('A')
+        graph.add_vertex('B')
+        vertex_ids = graph.vertex_ids()
+        neighbor_ids = vertex_a.neighbor_ids()
+
+        graph.add_vertex('C')
+        graph.add_edge('A', 'C')
+        self.assertEqual(list(vertex_ids), ['A', 'B', 'C'])
+        self.assertEqual(list(neighbor_ids), ['C'])
+        self.assertEqual(vertex_a.degree(), 1)
+        self.assertTrue(vertex_a.has_neighbor('C'))
+        self.assertEqual([v.get_id() for v in vertex_a.iter_neighbors()], ['C'])
+        self.assertEqual(len(graph.vertices_view()), graph.num_vertices())
+
 class TestReadGraphFromFile(unittest.TestCase):
     def test_read_directed_graph_from_file(self):
         filename = 'test_files/graph_small_directed.txt'
@@ -76,6 +130,12 @@ class TestReadGraphFromFile(unittest.TestCase):
         with self.assertRaises(ValueError) as error:
             graph = read_graph_from_file(filename)
 
+    def test_read_edges_across_chunks(self):
+        data = io.BytesIO(b'(A,B)\n(BB,C)\n\n(C,DDD)')
+
+        edges = list(read_edges(data, chunk_size=4))
+        self.assertEqual(edges, [('A', 'B'), ('BB', 'C'), ('C', 'DDD')])
+
     def test_find_shortest_path(self):
         filename = 'test_files/graph_medium_undirected.txt'
         graph = read_graph_from_file(filename)
@@ -84,6 +144,22 @@ class TestReadGraphFromFile(unittest.TestCase):
 
         self.assertEqual(len(path_from_A_to_F), 4)
 
+        path_from_A_to_F = graph.find_shortest_path('A', 'F', bidirectional=False)
+        self.assertEqual(len(path_from_A_to_F), 4)
+
+    def test_find_shortest_path_directed(self):
+        graph = Graph(is_directed=True)
+        for vertex_id in 'ABCDE':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A', 'B')
+        graph.add_edge('B', 'C')
+        graph.add_edge('C', 'D')
+        graph.add_edge('A', 'E')
+        graph.add_edge('E', 'D')
+
+        self.assertEqual(graph.find_shortest_path('A', 'D'), ['A', 'E', 'D'])
+        self.assertIsNone(graph.find_shortest_path('D', 'A'))
+
     def test_get_all_vertices_n_away(self):
         filename = 'test_files/graph_medium_undirected.txt'
         graph = read_graph_from_file(filename)
@@ -0,0 +1,79 @@
+import asyncio
+import json
+import unittest
+from graphs.csr_graph import CSRGraph
+from util.file_reader import read_graph_from_file
+from util.graph_server import GraphServer
+
+
+class BrokenGraph(CSRGraph):
+
+    def find_connected_components(self):
+        raise RuntimeError("worker died")
+
+
+class TestGraphServer(unittest.TestCase):
+
+    def setUp(self):
+        graph = read_graph_from_file('test_files/graph_medium_undirected.txt')
+        self.server = GraphServer(graph, batch_window=0.01)
+
+    def tearDown(self):
+        self.server.close()
+
+    def query(self, requests):
+        """Send every request on one connection and return the responses by id."""
+        async def run():
+            listener = await self.server.start(port=0)
+            port = listener.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            for request in requests:
+                writer.write(json.dumps(request).encode() + b'\n')
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in requests]
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+            return {response['id']: response for response in responses}
+
+        return asyncio.run(run())
+
+    def test_queries(self):
+        responses = self.query([
+            {'id': 1, 'op': 'shortest_path', 'start': 'A', 'target': 'F'},
+            {'id': 2, 'op': 'k_hop', 'start': 'A', 'k': 2},
+            {'id': 3, 'op': 'components'},
+            {'id': 4, 'op': 'shortest_path', 'start': 'A', 'target': 'Z'},
+            {'id': 5, 'op': 'teleport'},
+        ])
+
+        self.assertEqual(len(responses[1]['result']), 4)
+        self.assertEqual(sorted(responses[2]['result']), ['D', 'E'])
+        self.assertEqual(len(responses[3]['result']), 1)
+        self.assertIn('KeyError', responses[4]['error'])
+        self.assertIn('ValueError', responses[5]['error'])
+
+    def test_requests_with_one_source_share_a_traversal(self):
+        targets = ['B', 'C', 'D', 'E', 'F']
+        responses = self.query(
+            [{'id': i, 'op': 'shortest_path', 'start': 'A', 'target': target}
+             for i, target in enumerate(targets)])
+
+        self.assertEqual([responses[i]['result'][-1] for i in range(5)], targets)
+        stats = self.server.stats()
+        self.assertEqual(stats['traversals'], 1)
+        self.assertEqual(stats['operations']['shortest_path']['count'], 5)
+        self.assertIn('p99_ms', stats['operations']['shortest_path'])
+
+    def test_unexpected_errors_are_answered(self):
+        graph = BrokenGraph.from_graph(read_graph_from_file('test_files/graph_small_directed.txt'))
+        server = GraphServer(graph)
+        try:
+            response = asyncio.run(server.handle_request({'id': 7, 'op': 'components'}))
+        finally:
+            server.close()
+        self.assertEqual(response, {'id': 7, 'error': 'RuntimeError: worker died'})
+
+
+if __name__ == '__main__':
+    unittest.main()
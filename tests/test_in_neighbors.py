@@ -0,0 +1,66 @@
+import unittest
+from graphs.graph import Graph
+from util import generators
+
+
+def make_graph(**options):
+    graph = Graph(is_directed=True, index_in_neighbors=True, **options)
+    for vertex_id in 'ABCDE':
+        graph.add_vertex(vertex_id)
+    graph.add_edge('A', 'B')
+    graph.add_edges([('A', 'C'), ('B', 'D'), ('C', 'D'), ('A', 'C')])
+    return graph
+
+
+class TestInNeighborIndex(unittest.TestCase):
+
+    def test_degrees(self):
+        for compact in (False, True):
+            graph = make_graph(compact=compact)
+            self.assertEqual(graph.get_in_neighbors('D'), ['B', 'C'])
+            self.assertEqual(graph.get_in_neighbors('A'), [])
+            self.assertEqual(graph.in_degree('C'), 1)
+            self.assertEqual(graph.out_degree('A'), 2)
+
+            # replacing a vertex drops its edges from the index
+            graph.add_vertex('B')
+            self.assertEqual(graph.get_in_neighbors('D'), ['C'])
+
+    def test_reverse_bfs(self):
+        graph = make_graph()
+        self.assertEqual(list(graph.iter_bfs('D', reverse=True)), ['D', 'B', 'C', 'A'])
+        self.assertEqual(list(graph.iter_bfs('E', reverse=True)), ['E'])
+
+    def test_bidirectional_search(self):
+        dag = generators.random_dag(200, 600, seed=4)
+        edges = [(vertex.get_id(), neighbor_id)
+                 for vertex in dag.get_vertices() for neighbor_id in vertex.neighbor_ids()]
+        indexed = Graph.from_edges(edges, vertex_ids=dag.vertex_ids(), index_in_neighbors=True)
+
+        for target_id in map(str, range(0, 200, 7)):
+            expected = dag.find_shortest_path('0', target_id)
+            path = indexed.find_shortest_path('0', target_id)
+            if expected is None:
+                self.assertIsNone(path)
+                continue
+            self.assertEqual(len(path), len(expected))
+            for vertex_id, next_id in zip(path, path[1:]):
+                self.assertTrue(indexed.get_vertex(vertex_id).has_neighbor(next_id))
+
+    def test_topological_sort(self):
+        order = make_graph().topological_sort()
+        self.assertLess(order.index('A'), order.index('B'))
+        self.assertLess(order.index('C'), order.index('D'))
+
+    def test_requires_index(self):
+        graph = Graph(is_directed=True)
+        graph.add_vertex('A')
+        with self.assertRaises(ValueError):
+            graph.get_in_neighbors('A')
+
+        undirected = Graph.from_edges([('A', 'B')], directed=False)
+        self.assertEqual(undirected.get_in_neighbors('A'), ['B'])
+
+
+if __name__ == '__main__':
+    unittest.main()
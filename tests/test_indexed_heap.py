@@ -0,0 +1,28 @@
+import unittest
+from graphs.indexed_heap import IndexedMinHeap
+
+
+class TestIndexedMinHeap(unittest.TestCase):
+
+    def test_pop_in_priority_order(self):
+        heap = IndexedMinHeap()
+        for item, priority in [('A', 5), ('B', 2), ('C', 9), ('D', 1)]:
+            heap.push(item, priority)
+
+        popped = [heap.pop() for _ in range(len(heap))]
+        self.assertEqual(popped, [('D', 1), ('B', 2), ('A', 5), ('C', 9)])
+
+    def test_decrease_key(self):
+        heap = IndexedMinHeap()
+        heap.push('A', 5)
+        heap.push('B', 3)
+
+        self.assertTrue(heap.push('A', 1))
+        self.assertFalse(heap.push('B', 4))
+        self.assertEqual(heap.priority('B'), 3)
+        self.assertEqual(heap.pop(), ('A', 1))
+        self.assertNotIn('A', heap)
+
+
+if __name__ == '__main__':
+    unittest.main()
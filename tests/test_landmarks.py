@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+from graphs.landmarks import LandmarkOracle
+from util import generators
+
+
+class TestLandmarkOracle(unittest.TestCase):
+
+    def check_against_dijkstra(self, graph, oracle):
+        for start_id in ['0', '7', '23']:
+            distances = graph.single_source_distances(start_id)
+            for target_id in map(str, range(0, 60, 3)):
+                exact = distances.get(target_id)
+                self.assertEqual(oracle.distance(start_id, target_id), exact)
+                if exact is None:
+                    continue
+                self.assertLessEqual(oracle.lower_bound(start_id, target_id), exact)
+                self.assertGreaterEqual(oracle.upper_bound(start_id, target_id), exact)
+
+    def test_undirected(self):
+        graph = generators.random_weighted(60, 150, seed=5)
+        oracle = LandmarkOracle(graph, num_landmarks=4)
+
+        self.assertEqual(len(oracle.get_landmarks()), 4)
+        self.check_against_dijkstra(graph, oracle)
+        distance, path = oracle.shortest_path('0', '59')
+        self.assertEqual((path[0], path[-1]), ('0', '59'))
+
+    def test_directed(self):
+        graph = generators.random_weighted(60, 200, is_directed=True, seed=6, connected=False)
+        oracle = LandmarkOracle(graph, num_landmarks=5, strategy='random')
+
+        self.check_against_dijkstra(graph, oracle)
+
+    def test_save_and_load(self):
+        graph = generators.random_weighted(60, 200, is_directed=True, seed=7)
+        oracle = LandmarkOracle(graph, num_landmarks=3)
+        handle, filename = tempfile.mkstemp(suffix='.alt')
+        os.close(handle)
+        try:
+            oracle.save(filename)
+            loaded = LandmarkOracle.load(filename, graph)
+            self.assertEqual(loaded.get_landmarks(), oracle.get_landmarks())
+            self.assertEqual(loaded.lower_bound('3', '40'), oracle.lower_bound('3', '40'))
+            self.check_against_dijkstra(graph, loaded)
+
+            with open(filename, 'rb') as my_file:
+                data = my_file.read()
+            with open(filename, 'wb') as my_file:
+                my_file.write(data[:-16])
+            with self.assertRaisesRegex(ValueError, 'Corrupt'):
+                LandmarkOracle.load(filename, graph)
+
+            graph.add_edge('0', '1', 1000)
+            with self.assertRaises(ValueError):
+                LandmarkOracle.load(filename, graph)
+        finally:
+            os.remove(filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from graphs.graph import Graph
+from graphs.query_cache import QueryCache
+from graphs.weighted_graph import WeightedGraph
+
+
+class TestQueryCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = QueryCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 1, 'evictions': 1,
+                                         'size': 2, 'maxsize': 2})
+
+    def test_changing_a_result_does_not_change_the_cache(self):
+        graph = Graph(is_directed=False, query_cache_size=16)
+        for vertex_id in 'ABCD':
+            graph.add_vertex(vertex_id)
+        graph.add_edges([('A', 'B'), ('B', 'C')])
+
+        graph.find_shortest_path('A', 'C').append('ZZZ')
+        self.assertEqual(graph.find_shortest_path('A', 'C'), ['A', 'B', 'C'])
+
+        graph.find_connected_components().clear()
+        graph.find_connected_components()[0].clear()
+        self.assertEqual(sorted(map(sorted, graph.find_connected_components())),
+                         [['A', 'B', 'C'], ['D']])
+        self.assertEqual(graph.query_cache_stats()['hits'], 3)
+
+    def test_graph_results_are_cached_until_mutation(self):
+        graph = Graph(is_directed=False, query_cache_size=16)
+        for vertex_id in 'ABC':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A', 'B')
+
+        self.assertIsNone(graph.find_shortest_path('A', 'C'))
+        self.assertIsNone(graph.find_shortest_path('A', 'C'))
+        self.assertEqual(graph.query_cache_stats()['hits'], 1)
+
+        version = graph.get_version()
+        graph.add_edge('B', 'C')
+        self.assertGreater(graph.get_version(), version)
+        self.assertEqual(graph.find_shortest_path('A', 'C'), ['A', 'B', 'C'])
+
+    def test_weighted_graph_results_are_cached(self):
+        graph = WeightedGraph(is_directed=False, query_cache_size=16)
+        for vertex_id in 'ABC':
+            graph.add_vertex(vertex_id)
+        graph.add_edge('A', 'B', 1)
+        graph.add_edge('B', 'C', 2)
+
+        self.assertEqual(graph.find_shortest_path('A', 'C'), 3)
+        self.assertEqual(graph.find_shortest_path('A', 'C'), 3)
+        self.assertEqual(graph.query_cache_stats()['hits'], 1)
+
+        graph.add_edge('A', 'C', 1)
+        self.assertEqual(graph.find_shortest_path('A', 'C'), 1)
+
+    def test_cache_is_off_by_default(self):
+        graph = Graph()
+        self.assertIsNone(graph.get_query_cache())
+        self.assertIsNone(graph.query_cache_stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import random
+import unittest
+from graphs.graph import Graph
+from graphs.reachability import ReachabilityIndex
+from util import generators
+
+
+def assert_matches_bfs(test, graph):
+    for vertex_id1 in graph.vertex_ids():
+        reached = set(graph.bfs_traversal(vertex_id1))
+        test.assertEqual(sorted(graph.get_reachability_index().descendants(vertex_id1)),
+                         sorted(reached))
+        for vertex_id2 in graph.vertex_ids():
+            test.assertEqual(graph.reachable(vertex_id1, vertex_id2), vertex_id2 in reached)
+
+
+class TestReachabilityIndex(unittest.TestCase):
+
+    def test_follows_inserts(self):
+        rng = random.Random(5)
+        graph = Graph(track_reachability=True)
+        for vertex_id in range(30):
+            graph.add_vertex(vertex_id)
+        for step in range(60):
+            graph.add_edge(*rng.sample(range(30), 2))
+            if step % 10 == 0:
+                # cycles merge components, which rebuilds the index
+                assert_matches_bfs(self, graph)
+        graph.add_vertex(30)
+        graph.add_edges([(30, 0), (29, 30)])
+        assert_matches_bfs(self, graph)
+
+    def test_from_edges(self):
+        dag = generators.random_dag(50, 120, seed=2)
+        edges = [(vertex.get_id(), neighbor_id)
+                 for vertex in dag.get_vertices() for neighbor_id in vertex.neighbor_ids()]
+        graph = Graph.from_edges(edges, vertex_ids=dag.vertex_ids(), track_reachability=True)
+        assert_matches_bfs(self, graph)
+
+        index = graph.get_reachability_index()
+        self.assertEqual(index.num_components(), 50)
+        usage = index.memory_usage()
+        self.assertEqual(usage['total_bytes'], usage['bitset_bytes'] + usage['table_bytes'])
+
+    def test_standalone(self):
+        adjacency = {'A': ['B'], 'B': ['C', 'A'], 'C': [], 'D': ['C']}
+        index = ReachabilityIndex(adjacency, adjacency.__getitem__)
+
+        self.assertEqual(index.num_components(), 3)
+        self.assertTrue(index.reachable('A', 'C'))
+        self.assertTrue(index.reachable('B', 'A'))
+        self.assertFalse(index.reachable('C', 'D'))
+
+    def test_requires_tracking(self):
+        graph = Graph.from_edges([('A', 'B')])
+        with self.assertRaises(ValueError):
+            graph.reachable('A', 'B')
+        with self.assertRaises(ValueError):
+            Graph(is_directed=False, track_reachability=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
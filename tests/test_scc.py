@@ -0,0 +1,58 @@
+import unittest
+from graphs.graph import Graph
+
+
+def make_graph(edges, is_directed=True, vertex_ids='ABCDEF'):
+    graph = Graph(is_directed=is_directed)
+    for vertex_id in vertex_ids:
+        graph.add_vertex(vertex_id)
+    for vertex_id1, vertex_id2 in edges:
+        graph.add_edge(vertex_id1, vertex_id2)
+    return graph
+
+
+class TestStronglyConnectedComponents(unittest.TestCase):
+
+    def test_components(self):
+        graph = make_graph([('A', 'B'), ('B', 'C'), ('C', 'A'), ('C', 'D'),
+                            ('D', 'E'), ('E', 'D'), ('E', 'F')])
+
+        components = [sorted(c) for c in graph.strongly_connected_components()]
+        self.assertEqual(components, [['F'], ['D', 'E'], ['A', 'B', 'C']])
+
+    def test_condensation(self):
+        graph = make_graph([('A', 'B'), ('B', 'A'), ('B', 'C'), ('A', 'C'), ('D', 'C')])
+
+        components, dag = graph.condensation()
+        order = dag.topological_sort()
+        position = {vertex_id: order.index(i)
+                    for i, component in enumerate(components) for vertex_id in component}
+        self.assertEqual(len(components), 5)
+        self.assertLess(position['A'], position['C'])
+        self.assertLess(position['D'], position['C'])
+        self.assertEqual(position['A'], position['B'])
+        self.assertFalse(dag.contains_cycle())
+
+    def test_contains_cycle(self):
+        self.assertFalse(make_graph([('A', 'B'), ('B', 'C'), ('A', 'C')]).contains_cycle())
+        self.assertTrue(make_graph([('A', 'B'), ('B', 'C'), ('C', 'A')]).contains_cycle())
+        self.assertTrue(make_graph([('A', 'A')]).contains_cycle())
+
+        self.assertFalse(make_graph([('A', 'B'), ('B', 'C')], is_directed=False).contains_cycle())
+        self.assertTrue(make_graph([('A', 'B'), ('B', 'C'), ('C', 'A')],
+                                   is_directed=False).contains_cycle())
+
+    def test_long_chain_does_not_recurse(self):
+        graph = Graph(is_directed=True)
+        for i in range(100000):
+            graph.add_vertex(i)
+        graph.add_edges((i, i + 1) for i in range(99999))
+
+        self.assertFalse(graph.contains_cycle())
+        graph.add_edge(99999, 0)
+        self.assertTrue(graph.contains_cycle())
+        self.assertEqual(len(graph.strongly_connected_components()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
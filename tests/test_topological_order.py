@@ -0,0 +1,69 @@
+import random
+import unittest
+from graphs.graph import Graph
+
+
+def assert_valid_order(test, graph, order):
+    position = {vertex_id: i for i, vertex_id in enumerate(order)}
+    test.assertEqual(len(position), graph.num_vertices())
+    for vertex in graph.get_vertices():
+        for neighbor_id in vertex.neighbor_ids():
+            test.assertLess(position[vertex.get_id()], position[neighbor_id])
+
+
+class TestTopologicalOrder(unittest.TestCase):
+
+    def test_order_follows_inserts(self):
+        rng = random.Random(3)
+        graph = Graph(track_topological_order=True)
+        for vertex_id in range(60):
+            graph.add_vertex(vertex_id)
+
+        # insert the edges of a random DAG in random order, with every edge
+        # that would close a cycle rejected along the way
+        rejected = 0
+        for _ in range(400):
+            vertex_id1, vertex_id2 = rng.sample(range(60), 2)
+            try:
+                graph.add_edge(vertex_id1, vertex_id2)
+            except ValueError:
+                rejected += 1
+                self.assertFalse(graph.get_vertex(vertex_id1).has_neighbor(vertex_id2))
+            assert_valid_order(self, graph, graph.topological_sort())
+
+        self.assertGreater(rejected, 0)
+        self.assertFalse(graph.contains_cycle())
+
+    def test_rejects_cycles(self):
+        graph = Graph(track_topological_order=True)
+        for vertex_id in 'ABC':
+            graph.add_vertex(vertex_id)
+        graph.add_edges([('C', 'B'), ('B', 'A')])
+        self.assertEqual(graph.topological_sort(), ['C', 'B', 'A'])
+
+        with self.assertRaises(ValueError):
+            graph.add_edge('A', 'C')
+        with self.assertRaises(ValueError):
+            graph.add_edge('A', 'A')
+        self.assertEqual(graph.topological_sort(), ['C', 'B', 'A'])
+
+    def test_from_edges(self):
+        graph = Graph.from_edges([('A', 'B'), ('C', 'A')], track_topological_order=True)
+        self.assertEqual(graph.topological_sort(), ['C', 'A', 'B'])
+        graph.add_vertex('D')
+        graph.add_edge('D', 'C')
+        assert_valid_order(self, graph, graph.topological_sort())
+
+        with self.assertRaises(ValueError):
+            Graph.from_edges([('A', 'B'), ('B', 'A')], track_topological_order=True)
+
+    def test_untracked_cycle(self):
+        graph = Graph.from_edges([('A', 'B'), ('B', 'C'), ('C', 'B')])
+        with self.assertRaises(ValueError):
+            graph.topological_sort()
+        with self.assertRaises(ValueError):
+            Graph(is_directed=False, track_topological_order=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
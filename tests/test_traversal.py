@@ -0,0 +1,54 @@
+import unittest
+from graphs.graph import Graph
+from util.file_reader import read_graph_from_file
+
+
+def make_tree():
+    graph = Graph(is_directed=True)
+    for vertex_id in 'ABCDEF':
+        graph.add_vertex(vertex_id)
+    graph.add_edges([('A', 'B'), ('A', 'C'), ('B', 'D'), ('B', 'E'), ('C', 'F')])
+    return graph
+
+
+class TestTraversal(unittest.TestCase):
+
+    def test_bfs_traversal(self):
+        self.assertEqual(make_tree().bfs_traversal('A'), list('ABCDEF'))
+
+    def test_iter_bfs_with_details(self):
+        details = list(make_tree().iter_bfs('A', with_details=True))
+
+        self.assertEqual(details[0], ('A', 0, None))
+        self.assertEqual(details[-1], ('F', 2, 'C'))
+
+    def test_iter_dfs(self):
+        graph = make_tree()
+        finished = []
+
+        order = list(graph.iter_dfs('A', on_finish=finished.append))
+        self.assertEqual(order, list('ABDECF'))
+        self.assertEqual(finished, list('DEBFCA'))
+
+    def test_visitor_hooks(self):
+        graph = read_graph_from_file('test_files/graph_medium_undirected.txt')
+        discovered = {}
+        edges = []
+
+        list(graph.iter_bfs('A', on_discover=lambda v, depth, parent: discovered.update({v: depth}),
+                            on_edge=lambda u, v: edges.append((u, v))))
+        self.assertEqual(discovered, {'A': 0, 'B': 1, 'C': 1, 'D': 2, 'E': 2, 'F': 3})
+        self.assertEqual(len(edges), 18)
+
+    def test_early_termination(self):
+        graph = make_tree()
+        visited = []
+
+        for vertex_id in graph.iter_bfs('A', on_finish=visited.append):
+            if vertex_id == 'B':
+                break
+        self.assertEqual(visited, ['A'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,221 @@
+import os
+import tempfile
+import unittest
+from graphs.heuristics import manhattan_heuristic
+from graphs.weighted_graph import WeightedGraph
+from util import generators
+from util import file_reader
+from util.file_reader import _line_aligned_ranges, read_graph_from_file, write_graph_to_file
+
+
+def make_weighted_graph(is_directed=False):
+    graph = WeightedGraph(is_directed=is_directed)
+    for vertex_id in 'ABCDEF':
+        graph.add_vertex(vertex_id)
+    graph.add_edge('A', 'B', 4)
+    graph.add_edge('A', 'C', 1)
+    graph.add_edge('C', 'B', 2)
+    graph.add_edge('B', 'D', 5)
+    graph.add_edge('C', 'D', 8)
+    graph.add_edge('D', 'E', 3)
+    return graph
+
+
+class TestWeightedVertex(unittest.TestCase):
+
+    def test_neighbor_views(self):
+        graph = make_weighted_graph()
+        vertex_a = graph.get_vertex('A')
+
+        self.assertEqual(sorted(vertex_a.neighbor_ids()), ['B', 'C'])
+        self.assertEqual(dict(vertex_a.iter_neighbors_with_weights()), {'B': 4, 'C': 1})
+        self.assertEqual(vertex_a.get_weight('C'), 1)
+        self.assertIsNone(vertex_a.get_weight('E'))
+        self.assertEqual(vertex_a.degree(), 2)
+
+
+class TestConstructors(unittest.TestCase):
+
+    def test_from_weighted_edges(self):
+        graph = WeightedGraph.from_weighted_edges(
+            [('A', 'B', 4), ('A', 'C', 1), ('C', 'B', 2), ('A', 'B', 3)], directed=False)
+
+        self.assertEqual(graph.num_vertices(), 3)
+        self.assertEqual(graph.get_vertex('B').get_weight('A'), 3)
+        self.assertEqual(graph.find_shortest_path('A', 'B'), 3)
+
+    def test_from_adjacency(self):
+        graph = WeightedGraph.from_adjacency({'A': {'B': 4, 'C': 1}, 'C': [('B', 2)]})
+
+        self.assertEqual(sorted(graph.vertex_ids()), ['A', 'B', 'C'])
+        self.assertEqual(graph.find_shortest_path('A', 'B', return_path=True), (3, ['A', 'C', 'B']))
+
+    def test_add_edge_missing_vertex(self):
+        graph = WeightedGraph()
+        with self.assertRaisesRegex(KeyError, 'not in the graph'):
+            graph.add_edge('A', 'B', 1)
+
+
+class TestWeightedFile(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.filename = tempfile.mkstemp(suffix='.txt')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_read_weighted_graph(self):
+        graph = read_graph_from_file('test_files/graph_small_weighted.txt')
+
+        self.assertIsInstance(graph, WeightedGraph)
+        self.assertFalse(graph.is_directed())
+        self.assertEqual(graph.find_shortest_path('A', 'E', return_path=True),
+                         (11.5, ['A', 'C', 'B', 'D', 'E']))
+        self.assertEqual(graph.get_vertex('B').get_weight('A'), 4.0)
+
+    def test_parallel_round_trip(self):
+        graph = generators.random_weighted(300, 900, is_directed=True, seed=3)
+        write_graph_to_file(graph, self.filename)
+
+        for workers in (1, 3):
+            loaded = read_graph_from_file(self.filename, workers=workers)
+            self.assertTrue(loaded.is_directed())
+            self.assertEqual(sorted(loaded.get_edges()), sorted(graph.get_edges()))
+            self.assertIsInstance(loaded.get_edges()[0][2], int)
+        self.assertIsNone(file_reader._index_of)
+
+    def test_line_aligned_ranges(self):
+        with open(self.filename, 'w') as my_file:
+            my_file.write('WD\na,b\n' + '(a,b,1)\n' * 10)
+
+        ranges = _line_aligned_ranges(self.filename, 7, os.path.getsize(self.filename), 4)
+        self.assertEqual(ranges[0][0], 7)
+        self.assertEqual(ranges[-1][1], os.path.getsize(self.filename))
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(start % 8, 7) # every range starts on a line
+
+    def test_huge_weight(self):
+        with open(self.filename, 'w') as my_file:
+            my_file.write('WD\na,b,c\n(a,b,1)\n(b,c,%d)\n' % 2 ** 70)
+        graph = read_graph_from_file(self.filename)
+        self.assertEqual(graph.get_vertex('a').get_weight('b'), 1.0)
+        self.assertEqual(graph.get_vertex('b').get_weight('c'), float(2 ** 70))
+
+    def test_missing_weight(self):
+        with open(self.filename, 'w') as my_file:
+            my_file.write('WG\na,b\n(a,b)\n')
+        with self.assertRaises(ValueError):
+            read_graph_from_file(self.filename)
+
+
+class TestShortestPath(unittest.TestCase):
+
+    def test_find_shortest_path_weight(self):
+        graph = make_weighted_graph()
+
+        self.assertEqual(graph.find_shortest_path('A', 'E'), 11)
+        self.assertIsNone(graph.find_shortest_path('A', 'F'))
+
+    def test_find_shortest_path_with_path(self):
+        graph = make_weighted_graph()
+
+        weight, path = graph.find_shortest_path('A', 'E', return_path=True)
+        self.assertEqual(weight, 11)
+        self.assertEqual(path, ['A', 'C', 'B', 'D', 'E'])
+        self.assertEqual(graph.find_shortest_path('A', 'A', return_path=True), (0, ['A']))
+
+    def test_single_source_distances(self):
+        graph = make_weighted_graph(is_directed=True)
+
+        distances = graph.single_source_distances('A')
+        self.assertEqual(distances, {'A': 0, 'C': 1, 'B': 3, 'D': 8, 'E': 11})
+
+
+class TestAStar(unittest.TestCase):
+
+    def make_grid(self, size):
+        graph = WeightedGraph(is_directed=False)
+        coordinates = {}
+        for x in range(size):
+            for y in range(size):
+                graph.add_vertex((x, y))
+                coordinates[(x, y)] = (x, y)
+        for x in range(size):
+            for y in range(size):
+                if x + 1 < size:
+                    graph.add_edge((x, y), (x + 1, y), 1)
+                if y + 1 < size:
+                    graph.add_edge((x, y), (x, y + 1), 1)
+        return graph, coordinates
+
+    def test_matches_dijkstra(self):
+        graph = make_weighted_graph()
+
+        cost, path, _ = graph.astar('A', 'E')
+        self.assertEqual((cost, path), graph.find_shortest_path('A', 'E', return_path=True))
+        self.assertEqual(graph.astar('A', 'F')[:2], (None, None))
+
+    def test_heuristic_expands_fewer_vertices(self):
+        graph, coordinates = self.make_grid(15)
+
+        blind_cost, _, blind_expanded = graph.astar((0, 0), (14, 0))
+        cost, path, expanded = graph.astar((0, 0), (14, 0), coordinates=coordinates,
+                                           metric='manhattan')
+        self.assertEqual(cost, 14)
+        self.assertEqual(blind_cost, 14)
+        self.assertEqual(len(path), 15)
+        self.assertLess(expanded, blind_expanded)
+
+        cost, _, _ = graph.astar((0, 0), (14, 14), coordinates=coordinates)
+        self.assertEqual(cost, 28)
+        cost, _, _ = graph.astar((0, 0), (3, 4), heuristic=manhattan_heuristic(coordinates))
+        self.assertEqual(cost, 7)
+
+    def test_unknown_metric(self):
+        graph, coordinates = self.make_grid(2)
+        with self.assertRaises(ValueError):
+            graph.astar((0, 0), (1, 1), coordinates=coordinates, metric='chebyshev')
+
+
+class TestMinimumSpanningTree(unittest.TestCase):
+
+    def test_kruskal(self):
+        graph = make_weighted_graph()
+
+        tree = graph.minimum_spanning_tree_kruskal()
+        self.assertEqual(len(tree), 4)
+        self.assertEqual(sum(edge[2] for edge in tree), 11)
+
+    def test_kruskal_forest(self):
+        graph = make_weighted_graph()
+        graph.add_vertex('G')
+        graph.add_edge('F', 'G', 7)
+
+        tree = graph.minimum_spanning_tree_kruskal()
+        self.assertEqual(len(tree), 5)
+        self.assertEqual(sum(edge[2] for edge in tree), 18)
+
+    def test_prim(self):
+        graph = make_weighted_graph()
+
+        self.assertEqual(graph.minimum_spanning_tree_prim(), 11)
+
+        total, tree = graph.minimum_spanning_tree_prim(return_edges=True)
+        self.assertEqual(total, 11)
+        self.assertEqual(len(tree), 4)
+        self.assertEqual(sorted(edge[2] for edge in tree), [1, 2, 3, 5])
+
+    def test_prim_forest(self):
+        graph = make_weighted_graph()
+        graph.add_vertex('G')
+        graph.add_edge('F', 'G', 7)
+
+        total, tree = graph.minimum_spanning_tree_prim(return_edges=True)
+        self.assertEqual(total, 18)
+        self.assertEqual(len(tree), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
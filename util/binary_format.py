@@ -0,0 +1,124 @@
+import mmap
+import struct
+import sys
+from array import array
+
+from graphs.csr_graph import CSRGraph
+
+# File layout (all integers little-endian):
+#
+#   header      magic b'CSRG', version (u32), flags (u32), padding (u32),
+#               vertex count n (u64), edge count m (u64), id table size (u64)
+#   offsets     n + 1 int64
+#   targets     m int32, zero-padded to a multiple of 8 bytes
+#   weights     m float64, only if FLAG_WEIGHTED is set
+#   id table    the UTF-8 vertex ids, separated by newlines
+MAGIC = b'CSRG'
+VERSION = 1
+FLAG_DIRECTED = 1
+FLAG_WEIGHTED = 2
+HEADER = struct.Struct('<4sIIIQQQ')
+
+
+def _padding(size):
+    return -size % 8
+
+
+def _little_endian(values, typecode):
+    data = array(typecode, values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data.tobytes()
+
+
+def save_binary(graph, filename):
+    """
+    Write a graph to `filename` in the binary CSR format.
+
+    Arguments:
+    graph (Graph, WeightedGraph or CSRGraph): The graph to save. Vertex ids
+    must be strings without newlines.
+    filename (string): The path of the file to write
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = graph.freeze()
+
+    vertex_ids, offsets, targets = graph.arrays()
+    weights = graph.edge_weights()
+    for vertex_id in vertex_ids:
+        if not isinstance(vertex_id, str) or '\n' in vertex_id:
+            raise ValueError(f"Vertex id {vertex_id!r} cannot be stored in a binary graph file")
+    id_table = '\n'.join(vertex_ids).encode()
+
+    flags = 0
+    if graph.is_directed():
+        flags |= FLAG_DIRECTED
+    if weights is not None:
+        flags |= FLAG_WEIGHTED
+
+    with open(filename, 'wb') as my_file:
+        my_file.write(HEADER.pack(MAGIC, VERSION, flags, 0,
+                                  len(vertex_ids), len(targets), len(id_table)))
+        my_file.write(_little_endian(offsets, 'q'))
+        my_file.write(_little_endian(targets, 'i'))
+        my_file.write(bytes(_padding(4 * len(targets))))
+        if weights is not None:
+            my_file.write(_little_endian(weights, 'd'))
+        my_file.write(id_table)
+
+
+def load_binary(filename, use_mmap=True):
+    """
+    Load a graph written by `save_binary`.
+
+    With `use_mmap`, the offset, target and weight arrays are views straight
+    into the memory-mapped file, so nothing is copied and several processes
+    loading the same file share one copy in the page cache.
+
+    Arguments:
+    filename (string): The path of the file to read
+    use_mmap (boolean): Map the file instead of reading it into memory
+
+    Returns:
+    CSRGraph: The loaded graph
+    """
+    with open(filename, 'rb') as my_file:
+        if use_mmap:
+            buffer = mmap.mmap(my_file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buffer = my_file.read()
+
+    if len(buffer) < HEADER.size:
+        raise ValueError("Not a binary graph file")
+    magic, version, flags, _, num_vertices, num_edges, id_table_size = \
+        HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a binary graph file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported binary graph version {version}")
+
+    view = memoryview(buffer)
+    position = HEADER.size
+
+    def take(typecode, count):
+        nonlocal position
+        size = array(typecode).itemsize * count
+        section = view[position:position + size]
+        position += size
+        if sys.byteorder != 'little':
+            data = array(typecode, section.tobytes())
+            data.byteswap()
+            return data
+        return section.cast(typecode)
+
+    offsets = take('q', num_vertices + 1)
+    targets = take('i', num_edges)
+    position += _padding(4 * num_edges)
+    weights = take('d', num_edges) if flags & FLAG_WEIGHTED else None
+
+    id_table = bytes(view[position:position + id_table_size]).decode()
+    vertex_ids = id_table.split('\n') if num_vertices else []
+    if len(vertex_ids) != num_vertices:
+        raise ValueError("Corrupt binary graph file: vertex table does not match header")
+
+    return CSRGraph(vertex_ids, offsets, targets, bool(flags & FLAG_DIRECTED), weights)
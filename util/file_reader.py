@@ -1,40 +1,221 @@
+import multiprocessing
+import os
+from array import array
+from functools import partial
+
 from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+
+CHUNK_SIZE = 1 << 20 # bytes read from disk at a time
+RANGES_PER_WORKER = 4 # so a slow range does not leave the other workers idle
+
+# header line -> (is_directed, is_weighted)
+GRAPH_TYPES = {
+    'G': (False, False),
+    'D': (True, False),
+    'WG': (False, True),
+    'WD': (True, True),
+}
+
+# vertex id -> index, for a pool worker parsing weighted edges. Worker
+# processes receive it once when they start; ranges parsed in this process
+# get it passed explicitly instead.
+_index_of = None
+
+
+def read_edges(file_obj, chunk_size=CHUNK_SIZE, limit=None):
+    """
+    Lazily parse edge lines such as `(A,B)` or `(A,B,5)` from an open binary file.
+
+    The file is read in chunks of `chunk_size` bytes, so memory use stays
+    constant no matter how large the file is.
+
+    Arguments:
+    file_obj (file): A file opened in binary mode, positioned at the first edge line
+    chunk_size (integer): The number of bytes to read at a time
+    limit (integer): Stop after this many bytes. None reads to the end of the file.
 
+    Yields:
+    tuple<string>: The fields of each edge, e.g. ('A', 'B') or ('A', 'B', '5')
+    """
+    leftover = b''
+    while limit is None or limit > 0:
+        chunk = file_obj.read(chunk_size if limit is None else min(chunk_size, limit))
+        if not chunk:
+            break
+        if limit is not None:
+            limit -= len(chunk)
+        chunk = leftover + chunk
+        end = chunk.rfind(b'\n') + 1
+        leftover = chunk[end:]
+
+        for line in chunk[:end].decode().split('\n'):
+            line = line.strip()
+            if line:
+                yield tuple(line[1:-1].split(','))
+
+    line = leftover.decode().strip()
+    if line:
+        yield tuple(line[1:-1].split(','))
 
-def read_graph_from_file(filename):
+
+def read_graph_from_file(filename, workers=1):
     """
     Read in data from the specified filename, and create and return a graph
     object corresponding to that data.
 
+    The first line is the graph type: G (undirected) or D (directed), or WG
+    and WD for weighted graphs, whose edge lines carry a weight: `(A,B,5)`.
+
     Arguments:
     filename (string): The relative path of the file to be processed
+    workers (integer): The number of worker processes that parse the edges
+    of a weighted graph. 1 parses them in this process.
 
     Returns:
-    Graph: A directed or undirected Graph object containing the specified
-    vertices and edges
+    Graph or WeightedGraph: A directed or undirected graph object containing
+    the specified vertices and edges
     """
-    my_file = open(filename)
+    with open(filename, 'rb') as my_file:
+        graph_type = my_file.readline().decode().strip()
+        if graph_type not in GRAPH_TYPES:
+            raise ValueError("Unexpected character")
+        is_directed, is_weighted = GRAPH_TYPES[graph_type]
 
-    graph_type = my_file.readline().strip()
-    if graph_type == "G" :
-        graph = Graph(False)
-    elif graph_type == "D" :
-        graph = Graph(True)
+        vertices = my_file.readline().decode().strip().split(",")
+        if is_weighted:
+            edges_start = my_file.tell()
+        else:
+            graph = Graph(is_directed)
+            for vertex in vertices:
+                graph.add_vertex(vertex)
+
+            graph.add_edges(read_edges(my_file))
+            return graph
+
+    return _read_weighted_edges(filename, edges_start, vertices, is_directed, workers)
+
+
+def _read_weighted_edges(filename, start, vertices, is_directed, workers):
+    """
+    Parse the weighted edge lines from byte `start` to the end of the file,
+    split into line-aligned byte ranges that are parsed in parallel, and
+    merge them into a WeightedGraph.
+    """
+    end = os.path.getsize(filename)
+    num_ranges = workers * RANGES_PER_WORKER if workers > 1 else 1
+    tasks = [(filename, range_start, range_end)
+             for range_start, range_end in _line_aligned_ranges(filename, start, end, num_ranges)]
+    index_of = {vertex_id: i for i, vertex_id in enumerate(vertices)}
+
+    if workers <= 1 or len(tasks) <= 1:
+        parts = list(map(partial(_parse_weighted_range, index_of=index_of), tasks))
     else:
-        raise ValueError("Unexpected character")
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+        with context.Pool(workers, initializer=_init_parser, initargs=(index_of,)) as pool:
+            parts = pool.map(_parse_weighted_range, tasks)
+
+    # a file with any fractional weight gets float weights throughout
+    weight_type = 'd' if any(weights.typecode == 'd' for _, _, weights in parts) else 'q'
+    edges = ((vertices[source], vertices[target], weight)
+             for sources, targets, weights in parts
+             for source, target, weight in zip(sources, targets, array(weight_type, weights)))
+    return WeightedGraph.from_weighted_edges(edges, is_directed, vertex_ids=vertices)
+
+
+def _line_aligned_ranges(filename, start, end, num_ranges):
+    """
+    Split the bytes from `start` to `end` of a file into at most `num_ranges`
+    (start, end) ranges that each begin at the start of a line.
+    """
+    boundaries = [start]
+    with open(filename, 'rb') as my_file:
+        for i in range(1, num_ranges):
+            guess = start + (end - start) * i // num_ranges
+            if guess <= boundaries[-1]:
+                continue
+            # move forward to the start of the next line
+            my_file.seek(guess - 1)
+            my_file.readline()
+            position = min(my_file.tell(), end)
+            if position > boundaries[-1]:
+                boundaries.append(position)
+    boundaries.append(end)
+    return [(range_start, range_end) for range_start, range_end in zip(boundaries, boundaries[1:])
+            if range_end > range_start]
+
 
-    vertices = my_file.readline().strip().split(",")
-    for vertex in vertices:
-        graph.add_vertex(vertex)
+def _init_parser(index_of):
+    global _index_of
+    _index_of = index_of
 
 
-    for edge in my_file:
-        vertex1, vertex2 = edge.strip()[1:-1].split(",")
-        graph.add_edge(vertex1, vertex2)
+def _parse_weighted_range(task, index_of=None):
+    """
+    Parse the weighted edge lines in one byte range of a file, mapping ids to
+    indices with `index_of` or else the worker's map.
+
+    Returns:
+    (array<int>, array<int>, array): The source and target vertex indices and
+    the weights of the edges. Weights are integers ('q') unless one of them
+    has a fraction or does not fit in 64 bits, and then floats ('d').
+    """
+    filename, start, end = task
+    if index_of is None:
+        index_of = _index_of
+    sources = array('i')
+    targets = array('i')
+    weights = array('q')
+    with open(filename, 'rb') as my_file:
+        my_file.seek(start)
+        for fields in read_edges(my_file, limit=end - start):
+            if len(fields) != 3:
+                raise ValueError(f"Expected an edge with a weight, got {fields}")
+            vertex_id1, vertex_id2, weight = fields
+            for vertex_id in (vertex_id1, vertex_id2):
+                if vertex_id not in index_of:
+                    raise KeyError(f"Vertex {vertex_id!r} is not in the graph!")
+            sources.append(index_of[vertex_id1])
+            targets.append(index_of[vertex_id2])
+            try:
+                weights.append(int(weight))
+            except (ValueError, OverflowError): # a fraction, or too big for int64
+                if weights.typecode == 'q':
+                    weights = array('d', weights)
+                weights.append(float(weight))
+    return sources, targets, weights
+
+
+def write_graph_to_file(graph, filename):
+    """
+    Write a Graph or WeightedGraph to the specified filename in the format
+    read by `read_graph_from_file`.
+
+    Arguments:
+    graph (Graph or WeightedGraph): The graph to write
+    filename (string): The relative path of the file to be written
+    """
+    vertex_ids = list(graph.vertex_ids())
+    position = {vertex_id: i for i, vertex_id in enumerate(vertex_ids)}
+
+    with open(filename, 'w') as my_file:
+        if isinstance(graph, WeightedGraph):
+            my_file.write("WD\n" if graph.is_directed() else "WG\n")
+            my_file.write(",".join(vertex_ids) + "\n")
+            for vertex_id, neighbor_id, weight in graph.get_edges():
+                my_file.write(f"({vertex_id},{neighbor_id},{weight})\n")
+            return
 
-    return graph
+        my_file.write("D\n" if graph.is_directed() else "G\n")
+        my_file.write(",".join(vertex_ids) + "\n")
+        for vertex in graph.vertices_view():
+            vertex_id = vertex.get_id()
+            for neighbor_id in vertex.neighbor_ids():
+                # undirected edges are stored both ways; write them once
+                if graph.is_directed() or position[neighbor_id] >= position[vertex_id]:
+                    my_file.write(f"({vertex_id},{neighbor_id})\n")
 
-    pass
 
 if __name__ == '__main__':
 
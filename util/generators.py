@@ -0,0 +1,137 @@
+import random
+
+from graphs.graph import Graph
+from graphs.weighted_graph import WeightedGraph
+
+# Every generator takes a `seed`, so the same arguments always build the
+# same graph. Vertex ids are the strings '0'..'n-1', like the test files.
+
+
+def _new_graph(num_vertices, is_directed):
+    graph = Graph(is_directed=is_directed)
+    for i in range(num_vertices):
+        graph.add_vertex(str(i))
+    return graph
+
+
+def _random_pairs(rng, num_vertices, num_edges, is_directed, pairs=()):
+    """
+    Return `num_edges` distinct random (i, j) pairs with i != j, counting the
+    ones already in `pairs`. Undirected pairs have i < j.
+    """
+    max_edges = num_vertices * (num_vertices - 1)
+    if not is_directed:
+        max_edges //= 2
+    if num_edges > max_edges:
+        raise ValueError(f"A graph with {num_vertices} vertices has at most {max_edges} edges")
+
+    pairs = set(pairs)
+    while len(pairs) < num_edges:
+        i = rng.randrange(num_vertices)
+        j = rng.randrange(num_vertices)
+        if i == j:
+            continue
+        if not is_directed and i > j:
+            i, j = j, i
+        pairs.add((i, j))
+    return sorted(pairs)
+
+
+def erdos_renyi(num_vertices, num_edges, is_directed=False, seed=0):
+    """
+    Return a G(n, m) random graph: `num_edges` distinct edges chosen uniformly.
+    """
+    rng = random.Random(seed)
+    graph = _new_graph(num_vertices, is_directed)
+    graph.add_edges((str(i), str(j))
+                    for i, j in _random_pairs(rng, num_vertices, num_edges, is_directed))
+    return graph
+
+
+def barabasi_albert(num_vertices, edges_per_vertex, seed=0):
+    """
+    Return an undirected scale-free graph grown by preferential attachment:
+    each new vertex links to `edges_per_vertex` existing vertices, picked with
+    probability proportional to their degree.
+    """
+    if not 1 <= edges_per_vertex < num_vertices:
+        raise ValueError("edges_per_vertex must be between 1 and num_vertices - 1")
+
+    rng = random.Random(seed)
+    graph = _new_graph(num_vertices, False)
+    # every vertex appears here once per edge end, so a uniform pick from this
+    # list is a degree-proportional pick
+    endpoints = list(range(edges_per_vertex))
+    edges = []
+    for new in range(edges_per_vertex, num_vertices):
+        chosen = set()
+        while len(chosen) < edges_per_vertex:
+            chosen.add(rng.choice(endpoints))
+        for old in chosen:
+            edges.append((str(new), str(old)))
+            endpoints.extend((new, old))
+    graph.add_edges(edges)
+    return graph
+
+
+def grid(rows, columns):
+    """
+    Return an undirected `rows` x `columns` grid. Vertex `r * columns + c` is
+    joined to its right and lower neighbors.
+    """
+    graph = _new_graph(rows * columns, False)
+    edges = []
+    for r in range(rows):
+        for c in range(columns):
+            i = r * columns + c
+            if c + 1 < columns:
+                edges.append((str(i), str(i + 1)))
+            if r + 1 < rows:
+                edges.append((str(i), str(i + columns)))
+    graph.add_edges(edges)
+    return graph
+
+
+def chain(num_vertices, is_directed=True):
+    """Return a single path 0 -> 1 -> ... -> n-1."""
+    graph = _new_graph(num_vertices, is_directed)
+    graph.add_edges((str(i), str(i + 1)) for i in range(num_vertices - 1))
+    return graph
+
+
+def random_dag(num_vertices, num_edges, seed=0):
+    """
+    Return a random directed acyclic graph. Every edge goes from a lower to a
+    higher vertex number, after the numbers have been shuffled.
+    """
+    rng = random.Random(seed)
+    order = list(range(num_vertices))
+    rng.shuffle(order)
+    graph = _new_graph(num_vertices, True)
+    pairs = _random_pairs(rng, num_vertices, num_edges, False)
+    graph.add_edges((str(order[i]), str(order[j])) for i, j in pairs)
+    return graph
+
+
+def random_weighted(num_vertices, num_edges, is_directed=False, max_weight=100, seed=0,
+                    connected=True):
+    """
+    Return a random WeightedGraph with integer weights in 1..max_weight.
+    With `connected`, a random spanning tree is laid down first so every
+    vertex is reachable; it counts towards `num_edges`.
+    """
+    rng = random.Random(seed)
+    graph = WeightedGraph(is_directed=is_directed)
+    for i in range(num_vertices):
+        graph.add_vertex(str(i))
+
+    pairs = set()
+    if connected:
+        for j in range(1, num_vertices):
+            i = rng.randrange(j)
+            pairs.add((i, j))
+    pairs = _random_pairs(rng, num_vertices, max(num_edges, len(pairs)), is_directed, pairs)
+
+    for i, j in pairs:
+        graph.add_edge(str(i), str(j), rng.randint(1, max_weight))
+    return graph
@@ -0,0 +1,303 @@
+"""
+Serve queries against one resident graph over TCP or a Unix socket.
+
+Each request is one line of JSON and gets one line of JSON back, carrying the
+same "id" (responses on a connection may arrive out of order):
+
+    {"id": 1, "op": "shortest_path", "start": "A", "target": "F"}
+    {"id": 1, "result": ["A", "B", "D", "F"]}
+
+Operations: shortest_path (start, target), k_hop (start, k), components,
+topological_sort and stats.
+
+Usage:
+    python -m util.graph_server test_files/graph_medium_undirected.txt --port 8765
+    python -m util.graph_server graph.csrg --unix /tmp/graph.sock --workers 4
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import multiprocessing
+import time
+from collections import deque
+
+from graphs import batch_queries
+from graphs.csr_graph import CSRGraph
+from util.binary_format import load_binary
+from util.file_reader import read_graph_from_file
+
+LATENCY_SAMPLES = 10000 # per operation, for the percentiles in `stats`
+
+
+def load_graph(filename):
+    """
+    Load a graph for serving: binary files written by `save_binary` are
+    memory-mapped, anything else is parsed with `read_graph_from_file`.
+
+    Returns:
+    CSRGraph: The frozen graph.
+    """
+    with open(filename, 'rb') as my_file:
+        is_binary = my_file.read(4) == b'CSRG'
+    if is_binary:
+        return load_binary(filename)
+    return read_graph_from_file(filename).freeze()
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class GraphServer(object):
+    """ GraphServer Class
+    Answers newline-delimited JSON queries against one resident graph.
+
+    Requests that arrive within `batch_window` seconds of each other and share
+    a source vertex are merged, so one traversal answers all of them. The
+    traversals run in an executor, so the event loop keeps accepting requests.
+    """
+    def __init__(self, graph, batch_window=0.002, workers=0):
+        """
+        Parameters:
+        graph (CSRGraph or Graph): The graph to serve. A Graph is frozen first.
+        batch_window (float): How long to wait for more requests with the same
+        source before running a traversal, in seconds.
+        workers (integer): The number of worker processes. 0 runs traversals in
+        a single background thread of this process instead.
+        """
+        if not isinstance(graph, CSRGraph):
+            graph = graph.freeze()
+        self.__graph = graph
+        self.__batch_window = batch_window
+        self.__workers = workers
+        self.__executor = None
+
+        # (operation, source) -> list of (argument, future) waiting for a traversal
+        self.__pending = {}
+        # operation -> future of a whole-graph result, computed once
+        self.__whole_graph_results = {}
+
+        self.__latencies = {} # operation -> recent latencies, in seconds
+        self.__counts = {} # operation -> number of requests answered
+        self.__traversals = 0
+
+    def __get_executor(self):
+        if self.__executor is None:
+            if self.__workers > 0:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+                self.__executor = concurrent.futures.ProcessPoolExecutor(
+                    self.__workers, mp_context=context,
+                    initializer=batch_queries._init_worker, initargs=(self.__graph,))
+            else:
+                self.__executor = concurrent.futures.ThreadPoolExecutor(1)
+        return self.__executor
+
+    def close(self):
+        """Shut down the executor."""
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    async def __run(self, function, argument):
+        self.__traversals += 1
+        loop = asyncio.get_running_loop()
+        if self.__workers > 0:
+            # the worker processes already hold the graph
+            return await loop.run_in_executor(self.__get_executor(), function, argument)
+        return await loop.run_in_executor(self.__get_executor(), function, argument, self.__graph)
+
+    async def __batched(self, operation, source, argument):
+        """Queue one query and wait for the traversal that answers it."""
+        if not self.__graph.contains_id(source):
+            raise KeyError(f"Vertex {source!r} is not in the graph!")
+
+        future = asyncio.get_running_loop().create_future()
+        key = (operation, source)
+        if key not in self.__pending:
+            self.__pending[key] = []
+            asyncio.get_running_loop().call_later(
+                self.__batch_window, lambda: asyncio.ensure_future(self.__flush(key)))
+        self.__pending[key].append((argument, future))
+        return await future
+
+    async def __flush(self, key):
+        operation, source = key
+        waiting = self.__pending.pop(key)
+        function = (batch_queries._shortest_paths_from if operation == 'shortest_path'
+                    else batch_queries._vertices_n_away_from)
+        task = (source, [(i, argument) for i, (argument, _) in enumerate(waiting)])
+        try:
+            results = await self.__run(function, task)
+        except Exception as error:
+            for _, future in waiting:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for position, result in results:
+            future = waiting[position][1]
+            if not future.done():
+                future.set_result(result)
+
+    async def __whole_graph(self, method_name):
+        """Compute a result about the whole graph once; the graph never changes."""
+        if method_name not in self.__whole_graph_results:
+            self.__whole_graph_results[method_name] = asyncio.ensure_future(
+                self.__run(batch_queries._whole_graph_query, method_name))
+        try:
+            return await asyncio.shield(self.__whole_graph_results[method_name])
+        except (KeyError, ValueError, TypeError):
+            raise # the answer for this graph, e.g. a cycle
+        except Exception:
+            # a failure of the executor, not of the query; try again next time
+            self.__whole_graph_results.pop(method_name, None)
+            raise
+
+    def stats(self):
+        """
+        Return request counts and latency percentiles for each operation.
+
+        Returns:
+        dict: Operation -> {count, p50_ms, p90_ms, p99_ms, max_ms}, plus the
+        number of traversals run, which is lower than the request count when
+        requests were merged.
+        """
+        operations = {}
+        for operation, latencies in self.__latencies.items():
+            ordered = sorted(latencies)
+            operations[operation] = {
+                'count': self.__counts[operation],
+                'p50_ms': _percentile(ordered, 0.50) * 1000,
+                'p90_ms': _percentile(ordered, 0.90) * 1000,
+                'p99_ms': _percentile(ordered, 0.99) * 1000,
+                'max_ms': ordered[-1] * 1000,
+            }
+        return {
+            'vertices': self.__graph.num_vertices(),
+            'edges': self.__graph.num_edges(),
+            'traversals': self.__traversals,
+            'operations': operations,
+        }
+
+    async def handle_request(self, request):
+        """
+        Answer one decoded request.
+
+        Returns:
+        dict: The response, with either "result" or "error".
+        """
+        started = time.perf_counter()
+        operation = request.get('op')
+        response = {'id': request.get('id')}
+        try:
+            if operation == 'shortest_path':
+                target = request['target']
+                if not self.__graph.contains_id(target):
+                    raise KeyError(f"Vertex {target!r} is not in the graph!")
+                result = await self.__batched(operation, request['start'], target)
+            elif operation == 'k_hop':
+                k = request['k']
+                if not isinstance(k, int) or k < 0:
+                    raise ValueError("k must be a non-negative integer")
+                result = await self.__batched(operation, request['start'], k)
+            elif operation == 'components':
+                result = await self.__whole_graph('find_connected_components')
+            elif operation == 'topological_sort':
+                result = await self.__whole_graph('topological_sort')
+            elif operation == 'stats':
+                result = self.stats()
+            else:
+                raise ValueError(f"Unknown operation {operation!r}")
+            response['result'] = result
+        except Exception as error:
+            # e.g. a bad request, or a worker process that died: every
+            # request line still gets exactly one response line
+            response['error'] = f'{type(error).__name__}: {error}'
+
+        if 'result' in response and operation != 'stats':
+            self.__record(operation, time.perf_counter() - started)
+        return response
+
+    def __record(self, operation, latency):
+        if operation not in self.__latencies:
+            self.__latencies[operation] = deque(maxlen=LATENCY_SAMPLES)
+            self.__counts[operation] = 0
+        self.__latencies[operation].append(latency)
+        self.__counts[operation] += 1
+
+    async def handle_client(self, reader, writer):
+        """Serve one connection until the client closes it."""
+        tasks = set()
+
+        async def answer(line):
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("A request must be a JSON object")
+            except ValueError as error:
+                response = {'id': None, 'error': f'ValueError: {error}'}
+            else:
+                response = await self.handle_request(request)
+            writer.write(json.dumps(response).encode() + b'\n')
+            await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    # answer concurrently, so requests from one client can be merged
+                    task = asyncio.ensure_future(answer(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8765, unix_path=None):
+        """
+        Start listening. Pass `unix_path` to listen on a Unix socket instead of TCP.
+
+        Returns:
+        asyncio.Server: The running server.
+        """
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self.handle_client, path=unix_path)
+        return await asyncio.start_server(self.handle_client, host, port)
+
+
+async def _serve(args):
+    server = GraphServer(load_graph(args.filename), args.batch_window, args.workers)
+    listener = await server.start(args.host, args.port, args.unix)
+    where = args.unix or f'{args.host}:{args.port}'
+    print(f'Serving {args.filename} on {where}')
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('filename')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help='listen on this Unix socket path instead of TCP')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='worker processes for traversals (0: one background thread)')
+    parser.add_argument('--batch-window', type=float, default=0.002,
+                        help='seconds to wait for requests that can share a traversal')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()